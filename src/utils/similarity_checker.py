@@ -8,6 +8,67 @@ import re
 from typing import Set, Tuple, List, Dict
 from difflib import SequenceMatcher
 
+# Compiled once at import - extract_movie_and_fact runs for every title on
+# every duplicate check, so per-call re.match pattern lookups add up.
+# The optional "in " prefix folds the old two-pattern ladder into a single
+# engine invocation; the prefix is tried first, matching the old precedence,
+# and words merely starting with "in" fail the \s+ and fall through.
+_MOVIE_RE = re.compile(r'^(?:in\s+)?(.+?\s*\(\d{4}\)),?\s*(.+)$')
+
+# are_facts_similar patterns, compiled once instead of per comparison (the
+# duplicate filter calls it for every new-vs-existing title pair)
+_ACTORS_RE = re.compile(r'\b([A-Z][a-z]+ [A-Z][a-z]+)\b')
+
+_WEIGHT_RES = [re.compile(p) for p in (
+    r'gained.*(?:weight|pounds)', r'lost.*(?:weight|pounds)', r'weight', r'pounds'
+)]
+
+_TOPIC_PATTERN_RES = [(re.compile(p1), re.compile(p2)) for p1, p2 in [
+    # Dance/choreography patterns
+    (r'choreograph\w*', r'choreograph\w*'),
+    (r'danc\w*', r'danc\w*'),
+    (r'viral.*danc\w*', r'viral.*danc\w*'),
+    (r'moves?', r'sequence'),
+    # Improvisation patterns
+    (r'improvisd?\w*', r'improvisd?\w*'),
+    (r'ad[\s-]?libb?\w*', r'ad[\s-]?libb?\w*'),
+    (r'unscripted', r'spontaneous'),
+    (r'made.*up', r'on.*spot'),
+    # Acting method patterns
+    (r'method\s+act\w*', r'stayed.*character'),
+    (r'immersed.*role', r'preparation.*character'),
+    (r'never.*broke.*character', r'stayed.*character'),
+    (r'lived.*character', r'became.*character'),
+    # Physical transformation - treat ALL weight changes as similar
+    (r'gained.*(?:weight|pounds)', r'gained.*(?:weight|pounds)'),
+    (r'lost.*(?:weight|pounds)', r'lost.*(?:weight|pounds)'),
+    (r'gained.*(?:weight|pounds)', r'lost.*(?:weight|pounds)'),
+    (r'lost.*(?:weight|pounds)', r'gained.*(?:weight|pounds)'),
+    (r'(?:gained|lost).*(?:weight|pounds)', r'(?:weight|pounds).*(?:role|character)'),
+    (r'physical.*transformation', r'body.*change'),
+    (r'trained.*months?', r'workout.*routine'),
+    (r'diet', r'eating'),
+    # Real life patterns
+    (r'real\s+(?:life\s+)?(?:actual\s+)?', r'based.*true'),
+    (r'(?:actually\s+)?(?:really\s+)?happen\w*', r'true.*story'),
+    (r'inspired.*real', r'based.*actual'),
+    # Stunt patterns
+    (r'own.*stunts?', r'did.*stunts?'),
+    (r'stunt.*work', r'action.*sequence'),
+    (r'performed.*stunts?', r'no.*stunt.*double'),
+    # Injury patterns
+    (r'injured', r'hurt'),
+    (r'broke.*(?:during|while|filming)', r'fractured.*(?:during|while|filming)'),
+    (r'accident.*set', r'hurt.*filming'),
+    # Voice/accent patterns
+    (r'accent', r'voice'),
+    (r'learned.*speak', r'studied.*language'),
+    # Audition/casting patterns
+    (r'audition\w*', r'cast\w*'),
+    (r'almost.*played', r'originally.*cast'),
+    (r'first.*choice', r'wanted.*role'),
+]]
+
 
 class SimilarityChecker:
     """Check for semantic similarity between movie facts/titles."""
@@ -28,25 +89,17 @@ class SimilarityChecker:
     @staticmethod
     def extract_movie_and_fact(title: str) -> Tuple[str, str]:
         """Extract the movie/show name and the fact from a title."""
-        # Pattern to match "In MovieName (Year), fact..."
-        pattern = r'^in\s+(.+?\s*\(\d{4}\)),?\s*(.+)$'
-        match = re.match(pattern, title.lower())
-        
-        if match:
-            movie = match.group(1).strip()
-            fact = match.group(2).strip()
-            return movie, fact
-        
-        # Alternative pattern without "In" prefix
-        pattern2 = r'^(.+?\s*\(\d{4}\)),?\s*(.+)$'
-        match = re.match(pattern2, title.lower())
-        
+        lowered = title.lower()
+
+        # Matches "In MovieName (Year), fact..." with or without the "In"
+        match = _MOVIE_RE.match(lowered)
+
         if match:
             movie = match.group(1).strip()
             fact = match.group(2).strip()
             return movie, fact
-        
-        return "", title.lower().strip()
+
+        return "", lowered.strip()
     
     @staticmethod
     def extract_key_elements(fact: str) -> Set[str]:
@@ -148,72 +201,22 @@ class SimilarityChecker:
             return True
         
         # Check for same actor/character names (NEW)
-        actors_pattern = r'\b([A-Z][a-z]+ [A-Z][a-z]+)\b'
-        actors1 = set(re.findall(actors_pattern, fact1))
-        actors2 = set(re.findall(actors_pattern, fact2))
+        actors1 = set(_ACTORS_RE.findall(fact1))
+        actors2 = set(_ACTORS_RE.findall(fact2))
         if actors1 and actors2 and actors1 == actors2:
             # Same actors mentioned - check if rest is similar
             if jaccard_sim >= 0.2:  # Very low threshold when same actors
                 return True
         
         # Special check for physical transformations - any weight change is similar
-        weight_patterns = [r'gained.*(?:weight|pounds)', r'lost.*(?:weight|pounds)', r'weight', r'pounds']
-        has_weight1 = any(re.search(p, norm_fact1) for p in weight_patterns)
-        has_weight2 = any(re.search(p, norm_fact2) for p in weight_patterns)
+        has_weight1 = any(p.search(norm_fact1) for p in _WEIGHT_RES)
+        has_weight2 = any(p.search(norm_fact2) for p in _WEIGHT_RES)
         if has_weight1 and has_weight2:
             return True  # Any two weight-related facts are considered similar
-        
+
         # AGGRESSIVE pattern matching for common similar topics
-        patterns_to_check = [
-            # Dance/choreography patterns
-            (r'choreograph\w*', r'choreograph\w*'),
-            (r'danc\w*', r'danc\w*'),
-            (r'viral.*danc\w*', r'viral.*danc\w*'),
-            (r'moves?', r'sequence'),
-            # Improvisation patterns
-            (r'improvisd?\w*', r'improvisd?\w*'),
-            (r'ad[\s-]?libb?\w*', r'ad[\s-]?libb?\w*'),
-            (r'unscripted', r'spontaneous'),
-            (r'made.*up', r'on.*spot'),
-            # Acting method patterns
-            (r'method\s+act\w*', r'stayed.*character'),
-            (r'immersed.*role', r'preparation.*character'),
-            (r'never.*broke.*character', r'stayed.*character'),
-            (r'lived.*character', r'became.*character'),
-            # Physical transformation - treat ALL weight changes as similar
-            (r'gained.*(?:weight|pounds)', r'gained.*(?:weight|pounds)'),
-            (r'lost.*(?:weight|pounds)', r'lost.*(?:weight|pounds)'),
-            (r'gained.*(?:weight|pounds)', r'lost.*(?:weight|pounds)'),
-            (r'lost.*(?:weight|pounds)', r'gained.*(?:weight|pounds)'),
-            (r'(?:gained|lost).*(?:weight|pounds)', r'(?:weight|pounds).*(?:role|character)'),
-            (r'physical.*transformation', r'body.*change'),
-            (r'trained.*months?', r'workout.*routine'),
-            (r'diet', r'eating'),
-            # Real life patterns
-            (r'real\s+(?:life\s+)?(?:actual\s+)?', r'based.*true'),
-            (r'(?:actually\s+)?(?:really\s+)?happen\w*', r'true.*story'),
-            (r'inspired.*real', r'based.*actual'),
-            # Stunt patterns
-            (r'own.*stunts?', r'did.*stunts?'),
-            (r'stunt.*work', r'action.*sequence'),
-            (r'performed.*stunts?', r'no.*stunt.*double'),
-            # Injury patterns
-            (r'injured', r'hurt'),
-            (r'broke.*(?:during|while|filming)', r'fractured.*(?:during|while|filming)'),
-            (r'accident.*set', r'hurt.*filming'),
-            # Voice/accent patterns
-            (r'accent', r'voice'),
-            (r'learned.*speak', r'studied.*language'),
-            # Audition/casting patterns
-            (r'audition\w*', r'cast\w*'),
-            (r'almost.*played', r'originally.*cast'),
-            (r'first.*choice', r'wanted.*role'),
-        ]
-        
-        for pattern1, pattern2 in patterns_to_check:
-            match1 = re.search(pattern1, norm_fact1)
-            match2 = re.search(pattern2, norm_fact2)
-            if match1 and match2:
+        for pattern1, pattern2 in _TOPIC_PATTERN_RES:
+            if pattern1.search(norm_fact1) and pattern2.search(norm_fact2):
                 # Both facts contain similar special patterns
                 # Check if they're about the same subject with lower threshold
                 if jaccard_sim >= 0.15:  # EXTREMELY low threshold when patterns match
@@ -309,6 +312,77 @@ class SimilarityChecker:
         
         return False, ""
     
+    @staticmethod
+    def build_index(existing_titles: Set[str]) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Index existing titles by normalized movie name for fast duplicate checks.
+        Titles with no identifiable movie land in the '' bucket.
+        Returns dict of {normalized_movie: [(original_title, fact), ...]}
+        """
+        index: Dict[str, List[Tuple[str, str]]] = {}
+
+        for title in existing_titles:
+            movie, fact = SimilarityChecker.extract_movie_and_fact(title)
+            key = SimilarityChecker.normalize_text(movie) if movie else ''
+            index.setdefault(key, []).append((title, fact))
+
+        return index
+
+    @staticmethod
+    def add_to_index(title: str, index: Dict[str, List[Tuple[str, str]]]) -> None:
+        """Add an accepted title to an index built by build_index."""
+        movie, fact = SimilarityChecker.extract_movie_and_fact(title)
+        key = SimilarityChecker.normalize_text(movie) if movie else ''
+        index.setdefault(key, []).append((title, fact))
+
+    @staticmethod
+    def is_duplicate_title_indexed(new_title: str, index: Dict[str, List[Tuple[str, str]]]) -> Tuple[bool, str]:
+        """
+        Same checks as is_duplicate_title, but against a prebuilt index so only
+        titles that can actually collide (same movie, or no movie) are scanned.
+        Returns (is_duplicate, reason_or_similar_title)
+        """
+        new_movie, new_fact = SimilarityChecker.extract_movie_and_fact(new_title)
+
+        if new_movie:
+            # Movie usage limit (max 1 use per movie) is now a single dict lookup
+            same_movie = index.get(SimilarityChecker.normalize_text(new_movie), [])
+            if len(same_movie) >= 1:
+                return True, f"Movie '{new_movie}' already used {len(same_movie)} time(s) - maximum is 1"
+
+            # Titles with no identifiable movie still get the full-title check
+            for existing_title, _ in index.get('', []):
+                if SimilarityChecker.are_facts_similar(new_title, existing_title):
+                    return True, existing_title
+
+            return False, ""
+
+        # No movie identified - compare the full title against everything
+        for entries in index.values():
+            for existing_title, _ in entries:
+                if SimilarityChecker.are_facts_similar(new_title, existing_title):
+                    return True, existing_title
+
+        return False, ""
+
+    @staticmethod
+    def is_duplicate_bulk(new_titles: List[str], index: Dict[str, List[Tuple[str, str]]]) -> List[Tuple[bool, str]]:
+        """
+        Check a batch of candidate titles against a prebuilt index.
+        Accepted titles are added to the index as they pass, so duplicates
+        within the batch itself are caught too.
+        Returns list of (is_duplicate, reason) in input order.
+        """
+        results = []
+
+        for title in new_titles:
+            is_dup, reason = SimilarityChecker.is_duplicate_title_indexed(title, index)
+            results.append((is_dup, reason))
+            if not is_dup:
+                SimilarityChecker.add_to_index(title, index)
+
+        return results
+
     @staticmethod
     def get_used_movies(existing_titles: Set[str]) -> Dict[str, int]:
         """
@@ -337,21 +411,22 @@ class SimilarityChecker:
         """
         unique_titles = []
         duplicates = []
-        
-        # Also check for duplicates within the new titles themselves
-        all_titles_to_check = existing_titles.copy()
-        
+
+        # Index once instead of rescanning the whole set for every title;
+        # accepted titles join the index so intra-batch duplicates are caught
+        index = SimilarityChecker.build_index(existing_titles)
+
         for title in new_titles:
             title = title.strip()
             if not title:
                 continue
-            
-            is_dup, similar_to = SimilarityChecker.is_duplicate_title(title, all_titles_to_check)
-            
+
+            is_dup, similar_to = SimilarityChecker.is_duplicate_title_indexed(title, index)
+
             if is_dup:
                 duplicates.append((title, similar_to))
             else:
                 unique_titles.append(title)
-                all_titles_to_check.add(title)
-        
+                SimilarityChecker.add_to_index(title, index)
+
         return unique_titles, duplicates
\ No newline at end of file
@@ -37,18 +37,76 @@ import json
 import uuid
 import requests
 import threading
-from typing import Dict, List, Set, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set, Optional, Any, Union
 import io
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
-from google.auth.transport.requests import Request
+from googleapiclient.http import MediaIoBaseUpload
+from google.auth.transport.requests import Request, AuthorizedSession
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 import time
 import re
+import string
+import functools
+from itertools import islice
 from datetime import datetime, timedelta
 from src.utils.similarity_checker import SimilarityChecker
 
+try:
+    import orjson
+except ImportError:  # optional speedup - stdlib json handles everything
+    orjson = None
+
+# Exclusion-prompt templates, compiled once at import so each generation only
+# pays for substituting the variable parts (titles list + note).
+EXCLUSION_TMPL = string.Template("""
+🛑 RECENT TITLES FROM MY COLLECTION$titles_note 🛑
+
+These are my most recent movie facts. DO NOT use any movie that appears below:
+
+$all_existing_titles
+
+⚠️ RULES:
+1. Every movie above has been used - they are ALL off-limits
+2. Pick a movie that is NOT in the list above
+3. Each movie can only be used ONCE
+
+🎯 Generate a fact about a movie NOT in my list.
+""")
+
+UPDATED_EXCLUSION_TMPL = string.Template("""
+🛑 UPDATED TITLES$titles_note 🛑
+
+Script $script_num just added new titles. This is the updated list:
+
+$all_existing_titles
+
+⚠️ ALL movies above are OFF-LIMITS. Pick a different movie.
+""")
+
+# Scheduling intervals, built once instead of a fresh timedelta per check
+BACKUP_INTERVAL = timedelta(hours=3)
+REFRESH_INTERVAL = timedelta(seconds=30)
+
+# Static generation-prompt fragments, interned once at import instead of
+# rebuilt per generation run
+MOVIE_RULES_TAIL = "⚠️ MOVIE RULES: NEVER reuse a movie. Each movie gets ONE fact only. Check the BANNED MOVIES list and pick something completely different."
+FINAL_REMINDER = "⚠️ Don't use any movie from the list above!"
+
+@functools.lru_cache(maxsize=1)
+def _google_creds_info() -> dict:
+    """Parsed GOOGLE_CREDENTIALS secret.
+
+    The secret is a multiline JSON blob behind Streamlit's TOML-backed
+    secrets object; translate strips the control characters in one pass
+    (vs three replace() copies) and the parse is cached so re-auths don't
+    redo it.
+    """
+    creds_str = st.secrets['GOOGLE_CREDENTIALS']
+    return json.loads(creds_str.translate({ord('\n'): None, ord('\r'): None, ord('\t'): None}))
+
+
 # Page configuration
 st.set_page_config(
     page_title="YouTube Shorts Manager",
@@ -64,9 +122,129 @@ class GoogleDriveManager:
     SCOPES = ['https://www.googleapis.com/auth/drive.file']
     
     def __init__(self):
-        self.service = None
+        self._creds = None
+        # httplib2 transports must not be shared across threads, so each
+        # thread builds its own service client from the shared credentials
+        self._local = threading.local()
+        self._media_session = None
         self.folder_id = None
+        # (parent_folder_id, filename) -> file_id, so repeat lookups skip the
+        # files().list round-trip entirely
+        self._file_index = {}
+        # (parent_folder_id, filename) -> last content this process read or
+        # wrote; lets append_to_file skip re-downloading the whole file
+        self._content_cache = {}
         self.authenticate()
+
+    @property
+    def service(self):
+        """Per-thread Drive service client (None until authenticated)."""
+        if self._creds is None:
+            return None
+        svc = getattr(self._local, 'service', None)
+        if svc is None:
+            svc = build('drive', 'v3', credentials=self._creds)
+            self._local.service = svc
+        return svc
+
+    @property
+    def _session(self) -> Optional[AuthorizedSession]:
+        """Pooled HTTP session for raw media transfers.
+
+        httplib2 (behind the discovery client) opens a fresh TCP+TLS
+        connection per call; an AuthorizedSession rides urllib3's pool so
+        repeat downloads skip the handshakes. requests.Session is
+        thread-safe, so one shared instance is enough.
+        """
+        if self._creds is None:
+            return None
+        if self._media_session is None:
+            session = AuthorizedSession(self._creds)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16)
+            session.mount('https://', adapter)
+            self._media_session = session
+        return self._media_session
+
+    @staticmethod
+    def _q_escape(value: str) -> str:
+        """Escape a value for interpolation into a Drive q= query string.
+
+        Unescaped quotes in a channel name produce an HTTP 400, which the
+        silent except paths turn into "file missing" and re-uploads.
+        """
+        return value.replace("\\", "\\\\").replace("'", "\\'")
+
+    def _find_file_id(self, filename: str, parent_folder_id: str) -> Optional[str]:
+        """Resolve a filename to its Drive file ID, using the index first."""
+        key = (parent_folder_id, filename)
+        file_id = self._file_index.get(key)
+        if file_id:
+            return file_id
+
+        results = self.service.files().list(
+            q=f"name='{self._q_escape(filename)}' and parents='{parent_folder_id}' and trashed=false",
+            fields="files(id)",
+            pageSize=1
+        ).execute()
+
+        files = results.get('files', [])
+        if not files:
+            return None
+
+        file_id = files[0]['id']
+        self._file_index[key] = file_id
+        return file_id
+
+    def batch_find_file_ids(self, lookups: List[tuple]) -> Dict[tuple, Optional[str]]:
+        """Resolve several (filename, parent_folder_id) pairs at once.
+
+        Index hits are answered locally; all misses share one batched HTTP
+        request instead of a round-trip per file. Found IDs seed the index.
+        Returns {(filename, parent_folder_id): file_id_or_None}.
+        """
+        resolved = {}
+        pending = []
+
+        for filename, parent_id in lookups:
+            cached = self._file_index.get((parent_id, filename))
+            if cached:
+                resolved[(filename, parent_id)] = cached
+            else:
+                pending.append((filename, parent_id))
+
+        if not pending:
+            return resolved
+
+        def _make_callback(key):
+            def _cb(request_id, response, exception):
+                if exception is not None:
+                    resolved[key] = None
+                    return
+                files = response.get('files', [])
+                file_id = files[0]['id'] if files else None
+                resolved[key] = file_id
+                if file_id:
+                    self._file_index[(key[1], key[0])] = file_id
+            return _cb
+
+        try:
+            batch = self.service.new_batch_http_request()
+            for filename, parent_id in pending:
+                batch.add(
+                    self.service.files().list(
+                        q=f"name='{self._q_escape(filename)}' and parents='{parent_id}' and trashed=false",
+                        fields="files(id)",
+                        pageSize=1
+                    ),
+                    callback=_make_callback((filename, parent_id))
+                )
+            batch.execute()
+        except Exception:
+            # Fall back to per-file resolution via _find_file_id on demand
+            for key in pending:
+                resolved.setdefault(key, None)
+
+        return resolved
     
     def authenticate(self):
         """Authenticate with Google Drive API."""
@@ -75,13 +253,8 @@ class GoogleDriveManager:
         try:
             # Try to get credentials from Streamlit secrets first
             if 'GOOGLE_CREDENTIALS' in st.secrets:
-                import json
-                # Handle multiline JSON from secrets
-                creds_str = st.secrets['GOOGLE_CREDENTIALS']
-                # Remove any control characters that might be in the multiline string
-                creds_str = creds_str.replace('\n', '').replace('\r', '').replace('\t', '')
-                creds_info = json.loads(creds_str)
-                creds = Credentials.from_authorized_user_info(creds_info, self.SCOPES)
+                # Multiline JSON from secrets, cleaned and parsed once
+                creds = Credentials.from_authorized_user_info(_google_creds_info(), self.SCOPES)
             
             # Fallback to local files for development
             elif os.path.exists('token.json'):
@@ -113,7 +286,7 @@ class GoogleDriveManager:
                         st.error("Google Drive credentials not configured. Please contact admin.")
                         return False
             
-            self.service = build('drive', 'v3', credentials=creds)
+            self._creds = creds
             self.setup_app_folder()
             return True
             
@@ -124,10 +297,24 @@ class GoogleDriveManager:
     def setup_app_folder(self):
         """Create or find the app folder on Google Drive."""
         try:
+            # Re-auth path: a known folder ID just needs a cheap by-ID check
+            # instead of a by-name scan of the whole Drive root
+            if self.folder_id:
+                try:
+                    meta = self.service.files().get(
+                        fileId=self.folder_id, fields='id, trashed'
+                    ).execute()
+                    if not meta.get('trashed'):
+                        return
+                except Exception:
+                    pass  # Stale ID - fall through to the name search
+                self.folder_id = None
+
             # Search for existing folder
             results = self.service.files().list(
                 q="name='YouTube Shorts Manager' and mimeType='application/vnd.google-apps.folder' and trashed=false",
-                fields="files(id, name)"
+                fields="files(id)",
+                pageSize=1
             ).execute()
             
             folders = results.get('files', [])
@@ -151,62 +338,66 @@ class GoogleDriveManager:
         try:
             if parent_folder_id is None:
                 parent_folder_id = self.folder_id
-                
-            # Search for the file (exclude trashed files)
-            results = self.service.files().list(
-                q=f"name='{filename}' and parents='{parent_folder_id}' and trashed=false",
-                fields="files(id, name)"
-            ).execute()
-            
-            files = results.get('files', [])
-            
-            if not files:
+
+            file_id = self._find_file_id(filename, parent_folder_id)
+            if not file_id:
                 return ""  # File doesn't exist yet
-            
-            file_id = files[0]['id']
-            
-            # Download file content
-            request = self.service.files().get_media(fileId=file_id)
-            file_io = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_io, request)
-            
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-            
-            file_io.seek(0)
-            return file_io.read().decode('utf-8')
-            
+
+            # Download file content over the pooled session when available;
+            # the discovery-client path stays as a fallback
+            session = self._session
+            if session is not None:
+                response = session.get(
+                    f"https://www.googleapis.com/drive/v3/files/{file_id}",
+                    params={'alt': 'media'},
+                    timeout=60
+                )
+                response.raise_for_status()
+                content = response.content.decode('utf-8')
+            else:
+                # The files here are text files in the KB range, so one
+                # get_media().execute() fetches everything in a single
+                # request - no chunked-download state machine needed
+                content = self.service.files().get_media(fileId=file_id).execute().decode('utf-8')
+
+            self._content_cache[(parent_folder_id, filename)] = content
+            return content
+
         except Exception as e:
+            # The cached ID may be stale (file trashed elsewhere) - re-resolve next time
+            self._file_index.pop((parent_folder_id, filename), None)
             return ""
     
-    def write_file(self, filename: str, content: str, parent_folder_id: str = None):
-        """Write a file to Google Drive."""
+    def write_file(self, filename: str, content: Union[str, bytes], parent_folder_id: str = None):
+        """Write a file to Google Drive.
+
+        Accepts bytes so callers that already hold a serialized payload
+        (e.g. orjson output) skip the str round-trip.
+        """
         try:
             if parent_folder_id is None:
                 parent_folder_id = self.folder_id
-                
-            # Check if file already exists (exclude trashed files)
-            results = self.service.files().list(
-                q=f"name='{filename}' and parents='{parent_folder_id}' and trashed=false",
-                fields="files(id, name)"
-            ).execute()
-            
-            files = results.get('files', [])
-            
-            # Prepare content
+
+            # Check if file already exists (index hit avoids the list call)
+            file_id = self._find_file_id(filename, parent_folder_id)
+
+            # Prepare content. Small payloads (all the text files here) go
+            # up in a single multipart request; a resumable upload costs an
+            # extra session-initiation round-trip and only pays off once
+            # the body is big enough to be worth resuming
+            payload = content if isinstance(content, bytes) else content.encode('utf-8')
             media = MediaIoBaseUpload(
-                io.BytesIO(content.encode('utf-8')),
+                io.BytesIO(payload),
                 mimetype='text/plain',
-                resumable=True
+                resumable=len(payload) >= 5 * 1024 * 1024
             )
-            
-            if files:
+
+            if file_id:
                 # Update existing file
-                file_id = files[0]['id']
                 self.service.files().update(
                     fileId=file_id,
-                    media_body=media
+                    media_body=media,
+                    fields='id'
                 ).execute()
             else:
                 # Create new file
@@ -214,28 +405,90 @@ class GoogleDriveManager:
                     'name': filename,
                     'parents': [parent_folder_id]
                 }
-                self.service.files().create(
+                created = self.service.files().create(
                     body=file_metadata,
                     media_body=media,
                     fields='id'
                 ).execute()
-                
+                if created.get('id'):
+                    self._file_index[(parent_folder_id, filename)] = created['id']
+
+            # The content cache stays str - read_file and append_to_file
+            # consume text
+            self._content_cache[(parent_folder_id, filename)] = (
+                content if isinstance(content, str) else content.decode('utf-8')
+            )
+
         except Exception as e:
+            self._file_index.pop((parent_folder_id, filename), None)
+            self._content_cache.pop((parent_folder_id, filename), None)
             st.error(f"Failed to save {filename}: {str(e)}")
     
+    def delete_file(self, filename: str, parent_folder_id: str = None) -> bool:
+        """Delete a file from Google Drive.
+
+        Returns True once the file is gone, including when it never
+        existed. One metadata round-trip plus the delete - no empty media
+        body to frame and upload.
+        """
+        try:
+            if parent_folder_id is None:
+                parent_folder_id = self.folder_id
+
+            file_id = self._find_file_id(filename, parent_folder_id)
+            if file_id:
+                self.service.files().delete(fileId=file_id).execute()
+
+            self._file_index.pop((parent_folder_id, filename), None)
+            self._content_cache.pop((parent_folder_id, filename), None)
+            return True
+
+        except Exception as e:
+            self._file_index.pop((parent_folder_id, filename), None)
+            self._content_cache.pop((parent_folder_id, filename), None)
+            st.error(f"Failed to delete {filename}: {str(e)}")
+            return False
+
     def append_to_file(self, filename: str, content: str, parent_folder_id: str = None):
         """Append content to a file on Google Drive."""
-        existing_content = self.read_file(filename, parent_folder_id)
+        if parent_folder_id is None:
+            parent_folder_id = self.folder_id
+
+        # All writes go through this manager, so the cached copy is current;
+        # only fall back to a download when we've never seen the file
+        existing_content = self._content_cache.get((parent_folder_id, filename))
+        if existing_content is None:
+            existing_content = self.read_file(filename, parent_folder_id)
+
         new_content = existing_content + content
         self.write_file(filename, new_content, parent_folder_id)
     
+    def copy_file(self, file_id: str, new_name: str, parent_folder_id: str) -> Optional[str]:
+        """Copy a file server-side on Drive - no bytes pass through this process."""
+        try:
+            copied = self.service.files().copy(
+                fileId=file_id,
+                body={'name': new_name, 'parents': [parent_folder_id]},
+                fields='id'
+            ).execute()
+
+            new_id = copied.get('id')
+            if new_id:
+                self._file_index[(parent_folder_id, new_name)] = new_id
+            return new_id
+
+        except Exception as e:
+            st.error(f"Failed to copy file to {new_name}: {str(e)}")
+            return None
+
     def get_or_create_channel_folder(self, channel_name: str) -> str:
         """Get or create a folder for a specific channel."""
         try:
             # Search for existing channel folder (exclude trashed folders)
             results = self.service.files().list(
-                q=f"name='{channel_name}' and parents='{self.folder_id}' and mimeType='application/vnd.google-apps.folder' and trashed=false",
-                fields="files(id, name)"
+                q=f"name='{self._q_escape(channel_name)}' and parents='{self.folder_id}' and mimeType='application/vnd.google-apps.folder' and trashed=false",
+                fields="files(id)",
+                pageSize=1
             ).execute()
             
             folders = results.get('files', [])
@@ -256,31 +509,35 @@ class GoogleDriveManager:
             st.error(f"Error getting/creating channel folder for {channel_name}: {str(e)}")
             return self.folder_id  # Fallback to main folder
     
-    def get_or_create_backup_folder(self, channel_folder_id: str, channel_name: str) -> str:
+    def get_or_create_backup_folder(self, channel_folder_id: str, channel_name: str, show_status: bool = True) -> str:
         """Get or create a backup folder within a channel folder."""
         try:
             backup_folder_name = "Backups"
-            
+
             # Validate that we have a service connection
             if not self.service:
-                st.error(f"Google Drive service not available for backup folder creation")
+                if show_status:
+                    st.error(f"Google Drive service not available for backup folder creation")
                 return None
             
             # Search for existing backup folder
             results = self.service.files().list(
                 q=f"name='{backup_folder_name}' and parents='{channel_folder_id}' and mimeType='application/vnd.google-apps.folder' and trashed=false",
-                fields="files(id, name)"
+                fields="files(id)",
+                pageSize=1
             ).execute()
             
             folders = results.get('files', [])
             
             if folders:
                 backup_folder_id = folders[0]['id']
-                st.success(f"✅ Found existing backup folder for {channel_name}")
+                if show_status:
+                    st.success(f"✅ Found existing backup folder for {channel_name}")
                 return backup_folder_id
             else:
                 # Create new backup folder
-                st.info(f"📁 Creating backup folder for {channel_name}...")
+                if show_status:
+                    st.info(f"📁 Creating backup folder for {channel_name}...")
                 folder_metadata = {
                     'name': backup_folder_name,
                     'mimeType': 'application/vnd.google-apps.folder',
@@ -290,14 +547,17 @@ class GoogleDriveManager:
                 backup_folder_id = folder.get('id')
                 
                 if backup_folder_id:
-                    st.success(f"✅ Created backup folder for {channel_name}")
+                    if show_status:
+                        st.success(f"✅ Created backup folder for {channel_name}")
                     return backup_folder_id
                 else:
-                    st.error(f"Failed to get backup folder ID for {channel_name}")
+                    if show_status:
+                        st.error(f"Failed to get backup folder ID for {channel_name}")
                     return None
-                
+
         except Exception as e:
-            st.error(f"Error getting/creating backup folder for {channel_name}: {str(e)}")
+            if show_status:
+                st.error(f"Error getting/creating backup folder for {channel_name}: {str(e)}")
             return None  # Return None instead of fallback to indicate failure
 
 
@@ -316,6 +576,16 @@ class ClaudeClient:
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01"
         }
+        # One session for all calls: keeps the TLS connection alive between
+        # scripts instead of paying the handshake on every request. The
+        # adapter sizes the pool for the worker fan-out so concurrent batch
+        # calls reuse connections instead of opening one per request
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount('https://', adapter)
+        # Shared worker pool for async submissions and batch generation
+        self._executor = ThreadPoolExecutor(max_workers=4)
     
     def generate_script(self, prompt: str, session_id: str) -> Dict[str, Any]:
         """Generate a YouTube short script using Claude API with retry logic."""
@@ -336,9 +606,8 @@ class ClaudeClient:
         
         for attempt in range(max_retries):
             try:
-                response = requests.post(
+                response = self.session.post(
                     self.base_url,
-                    headers=self.headers,
                     json=payload,
                     timeout=timeout
                 )
@@ -362,14 +631,21 @@ class ClaudeClient:
                             "total_tokens": total_tokens
                         }
                     }
+                elif response.status_code in (429, 500, 502, 503, 504) and attempt < max_retries - 1:
+                    # Rate limits and transient server errors are worth
+                    # retrying. Honor Retry-After when the API sends it,
+                    # otherwise back off exponentially (2s, 4s)
+                    try:
+                        delay = float(response.headers.get('Retry-After'))
+                    except (TypeError, ValueError):
+                        delay = 2 ** (attempt + 1)
+                    st.warning(f"⏳ API returned {response.status_code}. Retrying in {int(delay)}s... (Attempt {attempt + 2}/{max_retries})")
+                    time.sleep(min(delay, 30))
                 else:
-                    # If not a timeout error, don't retry
-                    if response.status_code != 504:
-                        return {
-                            "success": False,
-                            "error": f"API Error {response.status_code}: {response.text}"
-                        }
-                    # Otherwise, continue to retry
+                    return {
+                        "success": False,
+                        "error": f"API Error {response.status_code}: {response.text}"
+                    }
                     
             except requests.exceptions.Timeout as e:
                 # Timeout error - retry
@@ -408,6 +684,61 @@ class ClaudeClient:
             "error": "Failed to generate script after all retries"
         }
 
+    def generate_script_stream(self, prompt: str, session_id: str):
+        """Yield response text chunks as they arrive from the Claude API.
+
+        Uses the API's SSE streaming mode so the first tokens show up in
+        1-2s instead of after the full 10-30s generation. Raises on HTTP or
+        network errors - callers fall back to the buffered generate_script,
+        which owns the retry logic.
+        """
+        payload = {
+            "model": "claude-3-5-sonnet-20241022",
+            "max_tokens": 1000,
+            "stream": True,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+
+        with self.session.post(self.base_url, json=payload, timeout=60, stream=True) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"API Error {response.status_code}: {response.text}")
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data: "):
+                    continue
+                event = json.loads(line[6:])
+                if event.get("type") == "content_block_delta":
+                    text = event.get("delta", {}).get("text")
+                    if text:
+                        yield text
+
+    def generate_script_async(self, prompt: str, session_id: str):
+        """Submit a generation to the client's worker pool.
+
+        Returns a concurrent.futures.Future right away instead of blocking
+        the calling thread for the full 10-30s LLM latency; the caller
+        collects the result (or checks .done()) when it needs it.
+        """
+        return self._executor.submit(self.generate_script, prompt, session_id)
+
+    def generate_batch(self, prompts: List[str], session_ids: List[str]) -> List[Dict[str, Any]]:
+        """Generate several scripts concurrently.
+
+        The calls are pure network waits, so overlapping them on the shared
+        worker pool cuts wall-clock time roughly by the worker count.
+        Results come back in input order, one per prompt.
+        """
+        futures = [
+            self.generate_script_async(prompt, session_id)
+            for prompt, session_id in zip(prompts, session_ids)
+        ]
+        return [future.result() for future in futures]
+
 
 class ChannelManager:
     """Manages channel definitions and per-channel title tracking using Google Drive."""
@@ -415,7 +746,68 @@ class ChannelManager:
     def __init__(self, drive_manager: GoogleDriveManager):
         self.drive_manager = drive_manager
         self.channels_file = "channels.json"
+        # Rebuilt lazily; mutations reset it
+        self._names_cache: Optional[tuple] = None
+        # channel name -> Drive folder ID; folders are never renamed outside
+        # the app, so entries stay valid for the manager's lifetime
+        self._channel_folder_ids: Dict[str, str] = {}
+        # channel name -> (titles filename, scripts filename)
+        self._filenames: Dict[str, tuple] = {}
+        # channel name -> set of used titles; read-through cache so repeated
+        # reads in a rerun don't round-trip Drive. Lives on the manager (one
+        # per process) rather than in session_state (one per browser tab)
+        self._titles_cache: Dict[str, Set[str]] = {}
+        # channel name -> Backups folder ID; like channel folders these are
+        # never renamed outside the app, so one lookup serves every backup
+        self._backup_folder_ids: Dict[str, str] = {}
+        # Last channels.json content written; save_channels compares
+        # against it to skip no-op uploads
+        self._last_saved_channels: Optional[Union[str, bytes]] = None
         self.channels = self.load_channels()
+        self._prime_channel_folder_ids()
+
+    def _prime_channel_folder_ids(self):
+        """Seed the folder-ID cache with one listing of the app folder.
+
+        Every per-channel operation needs the channel's folder ID; priming
+        them all in a single files().list replaces one lookup round-trip
+        per channel with one per manager. Best effort - a miss here just
+        means the per-channel lookup path fills the cache later.
+        """
+        try:
+            if not self.drive_manager or not self.drive_manager.service or not self.drive_manager.folder_id:
+                return
+            results = self.drive_manager.service.files().list(
+                q=f"parents='{self.drive_manager.folder_id}' and mimeType='application/vnd.google-apps.folder' and trashed=false",
+                fields="files(id, name)",
+                pageSize=1000
+            ).execute()
+            for folder in results.get('files', []):
+                self._channel_folder_ids.setdefault(folder['name'], folder['id'])
+        except Exception:
+            pass
+
+    def invalidate_titles_cache(self, channel_name: str):
+        """Drop the cached title set for a channel after an external mutation."""
+        self._titles_cache.pop(channel_name, None)
+
+    def _channel_filenames(self, channel_name: str) -> tuple:
+        """(titles_filename, scripts_filename) for a channel, lowered once."""
+        names = self._filenames.get(channel_name)
+        if names is None:
+            lowered = channel_name.lower()
+            names = (f"titles_{lowered}.txt", f"saved_scripts_{lowered}.txt")
+            self._filenames[channel_name] = names
+        return names
+
+    def _get_channel_folder_id(self, channel_name: str) -> str:
+        """Channel folder ID, resolved through Drive once then cached."""
+        folder_id = self._channel_folder_ids.get(channel_name)
+        if not folder_id:
+            folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
+            if folder_id:
+                self._channel_folder_ids[channel_name] = folder_id
+        return folder_id
     
     def load_channels(self) -> Dict[str, str]:
         """Load channel definitions from Google Drive channels.json."""
@@ -423,46 +815,58 @@ class ChannelManager:
             # Skip loading if Drive manager isn't ready
             if not self.drive_manager or not self.drive_manager.service:
                 return {}
-                
-            content = self.drive_manager.read_file(self.channels_file)
-            if content:
-                # Clean up content in case of formatting issues
-                content = content.strip()
-                if not content:
-                    return {}
-                    
-                channels = json.loads(content)
-                return channels
-            else:
+
+            channels = _load_channels_cached(self.drive_manager.folder_id or '', self.drive_manager)
+            if channels is None:
                 # Try to create initial channels file
                 initial_channels = {}
                 self.channels = initial_channels
                 self.save_channels()
                 return initial_channels
+
+            self._names_cache = None
+            # The cached dict is shared across sessions - work on a copy
+            return dict(channels)
         except json.JSONDecodeError as e:
             # Only show error to admins
             return {}
         except Exception as e:
             # Silent fail for default users
             return {}
-        return {}
-    
+
     def save_channels(self):
         """Save channel definitions to Google Drive channels.json."""
         try:
-            content = json.dumps(self.channels, indent=2, ensure_ascii=False)
+            # orjson emits bytes; write_file takes them as-is, so the
+            # str round-trip only happens on the stdlib fallback
+            if orjson is not None:
+                content = orjson.dumps(self.channels, option=orjson.OPT_INDENT_2)
+            else:
+                content = json.dumps(self.channels, indent=2, ensure_ascii=False)
+            # Skip the upload when nothing actually changed (e.g. an edit
+            # saved with identical text) - the serialize is cheap, the
+            # Drive write is not
+            if content == self._last_saved_channels:
+                return
             self.drive_manager.write_file(self.channels_file, content)
+            self._last_saved_channels = content
+            _load_channels_cached.clear()
         except Exception as e:
             st.error(f"Failed to save channels to Google Drive: {str(e)}")
     
     def add_channel(self, name: str, base_prompt: str):
         """Add a new channel with its base prompt."""
         self.channels[name] = base_prompt
+        self._names_cache = None
         self.save_channels()
-    
+
     def get_channel_names(self) -> List[str]:
         """Get list of all channel names."""
-        return list(self.channels.keys())
+        # Streamlit reruns main() constantly; keep the name tuple around
+        # instead of rebuilding the list from the dict every rerun
+        if self._names_cache is None:
+            self._names_cache = tuple(self.channels.keys())
+        return list(self._names_cache)
     
     def get_channel_prompt(self, name: str) -> str:
         """Get base prompt for a specific channel."""
@@ -480,53 +884,86 @@ class ChannelManager:
         """Delete a channel from the dropdown (removes from channels.json only)."""
         if name in self.channels:
             del self.channels[name]
+            self._names_cache = None
             self.save_channels()
             return True
         return False
     
     def get_used_titles(self, channel_name: str, force_refresh: bool = False) -> Set[str]:
         """Load used titles for a channel from Google Drive channel folder."""
-        filename = f"titles_{channel_name.lower()}.txt"
+        filename = self._channel_filenames(channel_name)[0]
         titles = set()
-        
-        # Cache key for this channel's titles
-        cache_key = f"cached_titles_{channel_name}"
-        
+
         # Use cache unless force_refresh is True
-        if not force_refresh and cache_key in st.session_state:
-            return st.session_state[cache_key]
-        
+        if not force_refresh and channel_name in self._titles_cache:
+            return self._titles_cache[channel_name]
+
         try:
             # Get or create the channel folder
-            channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
+            channel_folder_id = self._get_channel_folder_id(channel_name)
             content = self.drive_manager.read_file(filename, channel_folder_id)
             if content:
-                titles = {line.strip() for line in content.split('\n') if line.strip()}
+                # splitlines + filter(None): strip once per line, drop blanks
+                # at C level instead of stripping twice per line
+                titles = set(filter(None, map(str.strip, content.splitlines())))
                 # Update cache
-                st.session_state[cache_key] = titles
+                self._titles_cache[channel_name] = titles
         except Exception as e:
             pass
         return titles
     
     def get_used_titles_ordered(self, channel_name: str, force_refresh: bool = False) -> List[str]:
         """Load used titles for a channel in the same order as they appear in the file."""
-        filename = f"titles_{channel_name.lower()}.txt"
+        filename = self._channel_filenames(channel_name)[0]
         
         try:
             # Get or create the channel folder
-            channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
+            channel_folder_id = self._get_channel_folder_id(channel_name)
             content = self.drive_manager.read_file(filename, channel_folder_id)
             if content:
                 # Return as list to preserve order from the file
-                titles_list = [line.strip() for line in content.split('\n') if line.strip()]
+                # splitlines() handles \r\n and runs in one C-level pass
+                titles_list = [s for s in map(str.strip, content.splitlines()) if s]
                 return titles_list
         except Exception as e:
             pass
         return []
     
+    def prefetch_channel_files(self, channel_name: str):
+        """Warm the caches for a channel's Drive files.
+
+        Meant to run on a worker thread right after the user selects a
+        channel, so the first generate/save click finds the titles set and
+        the scripts file content already cached instead of paying the Drive
+        round-trips inline. Errors are swallowed - this is purely advisory
+        and every consumer re-reads on a cache miss anyway.
+        """
+        try:
+            channel_folder_id = self._get_channel_folder_id(channel_name)
+            self.get_used_titles(channel_name)
+            # Seeds the drive manager's content cache so the next
+            # append_to_file skips its read-before-write download
+            scripts_file = self._channel_filenames(channel_name)[1]
+            self.drive_manager.read_file(scripts_file, channel_folder_id)
+        except Exception:
+            pass
+
+    def prefetch_all_titles(self):
+        """Queue a background titles read for every channel not yet cached.
+
+        The reads are independent network waits, so they overlap on the
+        shared pool while the user is still picking a channel. Fire and
+        forget: get_used_titles swallows its own errors and later callers
+        re-read on a cache miss, so nothing waits on these futures.
+        """
+        pool = get_executor()
+        for channel_name in self.get_channel_names():
+            if channel_name not in self._titles_cache:
+                pool.submit(self.get_used_titles, channel_name)
+
     def add_title(self, channel_name: str, title: str):
         """Add a new title with similarity checking."""
-        filename = f"titles_{channel_name.lower()}.txt"
+        filename = self._channel_filenames(channel_name)[0]
         try:
             # Check for similar existing titles first
             existing_titles = self.get_used_titles(channel_name, force_refresh=False)
@@ -537,16 +974,16 @@ class ChannelManager:
                 return False
             
             # Get or create the channel folder
-            channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
+            channel_folder_id = self._get_channel_folder_id(channel_name)
             self.drive_manager.append_to_file(filename, f"{title}\n", channel_folder_id)
             
             # Update cache immediately after adding
-            cache_key = f"cached_titles_{channel_name}"
-            if cache_key in st.session_state:
-                st.session_state[cache_key].add(title)
+            if channel_name in self._titles_cache:
+                self._titles_cache[channel_name].add(title)
             else:
-                st.session_state[cache_key] = {title}
-            
+                self._titles_cache[channel_name] = {title}
+
+            _bump_titles_version(channel_name)
             return True
                 
         except Exception as e:
@@ -558,14 +995,21 @@ class ChannelManager:
         if not titles_list:
             return 0, 0
             
-        filename = f"titles_{channel_name.lower()}.txt"
+        filename = self._channel_filenames(channel_name)[0]
         try:
             # Get existing titles to avoid duplicates
             existing_titles = self.get_used_titles(channel_name, force_refresh=False)
-            
-            # Use similarity checker to filter duplicates
+
+            # Cheap exact-match pre-pass: hash lookups knock out verbatim
+            # repeats (the common case for large pastes) so only genuinely
+            # new strings pay for the similarity pass below
+            cleaned = [t for t in map(str.strip, titles_list) if t]
+            candidates = [t for t in cleaned if t not in existing_titles]
+            exact_dups = len(cleaned) - len(candidates)
+
+            # Use similarity checker to filter near-duplicates
             unique_titles, duplicates = SimilarityChecker.filter_duplicate_titles(
-                titles_list, existing_titles
+                candidates, existing_titles
             )
             
             # Process titles in batches to prevent memory issues
@@ -577,19 +1021,20 @@ class ChannelManager:
                 
                 # Write this batch to Google Drive if there are new titles
                 if batch:
-                    channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
+                    channel_folder_id = self._get_channel_folder_id(channel_name)
                     titles_content = "\n".join(batch) + "\n"
                     self.drive_manager.append_to_file(filename, titles_content, channel_folder_id)
                     total_added += len(batch)
                     
                     # Update cache with new titles from this batch
-                    cache_key = f"cached_titles_{channel_name}"
-                    if cache_key in st.session_state:
-                        st.session_state[cache_key].update(batch)
+                    if channel_name in self._titles_cache:
+                        self._titles_cache[channel_name].update(batch)
                     else:
-                        st.session_state[cache_key] = set(batch)
-            
-            return total_added, len(duplicates)
+                        self._titles_cache[channel_name] = set(batch)
+
+            if total_added:
+                _bump_titles_version(channel_name)
+            return total_added, len(duplicates) + exact_dups
             
         except Exception as e:
             st.error(f"Failed to bulk add titles for {channel_name} to Google Drive: {str(e)}")
@@ -597,17 +1042,17 @@ class ChannelManager:
     
     def delete_title(self, channel_name: str, title_to_delete: str):
         """Delete a specific title from a channel's Google Drive folder while preserving file order."""
-        filename = f"titles_{channel_name.lower()}.txt"
+        filename = self._channel_filenames(channel_name)[0]
         try:
             # Get the file content to preserve order
-            channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
+            channel_folder_id = self._get_channel_folder_id(channel_name)
             content = self.drive_manager.read_file(filename, channel_folder_id)
             
             if not content:
                 return False, f"No titles file found for {channel_name}"
             
             # Split into lines and preserve order
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
+            lines = [s for s in map(str.strip, content.splitlines()) if s]
             
             if title_to_delete not in lines:
                 return False, f"Title '{title_to_delete}' not found"
@@ -620,10 +1065,9 @@ class ChannelManager:
             self.drive_manager.write_file(filename, new_content, channel_folder_id)
             
             # Clear cache to force refresh
-            cache_key = f"cached_titles_{channel_name}"
-            if cache_key in st.session_state:
-                del st.session_state[cache_key]
-            
+            self.invalidate_titles_cache(channel_name)
+
+            _bump_titles_version(channel_name)
             return True, f"Title '{title_to_delete}' deleted successfully"
             
         except Exception as e:
@@ -635,7 +1079,7 @@ class ChannelManager:
         if not titles_to_delete:
             return 0, 0
             
-        filename = f"titles_{channel_name.lower()}.txt"
+        filename = self._channel_filenames(channel_name)[0]
         try:
             # Get all current titles
             current_titles = self.get_used_titles(channel_name, force_refresh=True)
@@ -654,16 +1098,16 @@ class ChannelManager:
             
             if deleted_count > 0:
                 # Rewrite the entire file without the deleted titles
-                channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
+                channel_folder_id = self._get_channel_folder_id(channel_name)
                 new_content = "\n".join(sorted(current_titles)) + ("\n" if current_titles else "")
                 self.drive_manager.write_file(filename, new_content, channel_folder_id)
                 
                 # Update cache
-                cache_key = f"cached_titles_{channel_name}"
-                if cache_key in st.session_state:
+                if channel_name in self._titles_cache:
                     for title in titles_to_delete:
-                        st.session_state[cache_key].discard(title.strip())
-            
+                        self._titles_cache[channel_name].discard(title.strip())
+                _bump_titles_version(channel_name)
+
             return deleted_count, not_found_count
             
         except Exception as e:
@@ -672,10 +1116,10 @@ class ChannelManager:
     
     def save_script(self, channel_name: str, content: str, session_id: str, user_name: str = None):
         """Save the full generated script to a channel's Google Drive folder."""
-        filename = f"saved_scripts_{channel_name.lower()}.txt"
+        filename = self._channel_filenames(channel_name)[1]
         try:
             # Get or create the channel folder
-            channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
+            channel_folder_id = self._get_channel_folder_id(channel_name)
             
             # Add user attribution and timestamp to the script
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -694,15 +1138,17 @@ class ChannelManager:
                 st.warning("Google Drive not available")
                 return False
                 
-            channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
-            filename = f"titles_{channel_name.lower()}.txt"
-            self.drive_manager.write_file(filename, "", channel_folder_id)
-            
+            channel_folder_id = self._get_channel_folder_id(channel_name)
+            filename = self._channel_filenames(channel_name)[0]
+            # Deleting beats uploading an empty body: one round-trip, and
+            # the file is recreated on the next title append anyway
+            if not self.drive_manager.delete_file(filename, channel_folder_id):
+                return False
+
             # Clear cache
-            cache_key = f"cached_titles_{channel_name}"
-            if cache_key in st.session_state:
-                del st.session_state[cache_key]
-            
+            self.invalidate_titles_cache(channel_name)
+
+            _bump_titles_version(channel_name)
             return True
         except Exception as e:
             st.error(f"Failed to clear titles: {str(e)}")
@@ -715,106 +1161,257 @@ class ChannelManager:
                 st.warning("Google Drive not available")
                 return False
                 
-            channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
-            filename = f"saved_scripts_{channel_name.lower()}.txt"
-            self.drive_manager.write_file(filename, "", channel_folder_id)
-            return True
+            channel_folder_id = self._get_channel_folder_id(channel_name)
+            filename = self._channel_filenames(channel_name)[1]
+            return self.drive_manager.delete_file(filename, channel_folder_id)
         except Exception as e:
             st.error(f"Failed to clear scripts: {str(e)}")
             return False
     
-    def backup_channel_files(self, channel_name: str):
-        """Create backup of channel files (titles and scripts)."""
+    def backup_channel_files(self, channel_name: str, quiet: bool = False):
+        """Create backup of channel files (titles and scripts).
+
+        quiet=True suppresses all st.* status output so the method is safe
+        to run from a worker thread (no Streamlit script context there).
+        """
         try:
             # Check if drive_manager exists and is properly initialized
             if not hasattr(self, 'drive_manager') or self.drive_manager is None:
-                st.warning("Google Drive not available for backup")
+                if not quiet:
+                    st.warning("Google Drive not available for backup")
                 return False
-                
+
             if not hasattr(self.drive_manager, 'service') or self.drive_manager.service is None:
-                st.warning("Google Drive service not available for backup")
+                if not quiet:
+                    st.warning("Google Drive service not available for backup")
                 return False
-                
+
             if not hasattr(self.drive_manager, 'get_or_create_channel_folder'):
-                st.warning("Google Drive folder management not available for backup")
+                if not quiet:
+                    st.warning("Google Drive folder management not available for backup")
                 return False
-                
-            channel_folder_id = self.drive_manager.get_or_create_channel_folder(channel_name)
+
+            channel_folder_id = self._get_channel_folder_id(channel_name)
             if not channel_folder_id:
-                st.warning("Could not access channel folder for backup")
+                if not quiet:
+                    st.warning("Could not access channel folder for backup")
                 return False
-            
-            # Get or create backup folder within the channel folder
-            backup_folder_id = self.drive_manager.get_or_create_backup_folder(channel_folder_id, channel_name)
+
+            # Get or create backup folder within the channel folder (cached
+            # after the first backup - saves a files().list per run)
+            backup_folder_id = self._backup_folder_ids.get(channel_name)
             if not backup_folder_id:
-                st.error("❌ Failed to create or access backup folder - backups will be stored in main channel folder")
+                backup_folder_id = self.drive_manager.get_or_create_backup_folder(
+                    channel_folder_id, channel_name, show_status=not quiet
+                )
+                if backup_folder_id:
+                    self._backup_folder_ids[channel_name] = backup_folder_id
+            if not backup_folder_id:
+                if not quiet:
+                    st.error("❌ Failed to create or access backup folder - backups will be stored in main channel folder")
                 backup_folder_id = channel_folder_id  # Fallback to main channel folder
                 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Backup titles file
-            titles_filename = f"titles_{channel_name.lower()}.txt"
-            titles_content = self.drive_manager.read_file(titles_filename, channel_folder_id)
-            if titles_content:
-                backup_titles = f"backup_titles_{channel_name.lower()}_{timestamp}.txt"
-                self.drive_manager.write_file(backup_titles, titles_content, backup_folder_id)
-            
-            # Backup scripts file
-            scripts_filename = f"saved_scripts_{channel_name.lower()}.txt"
-            scripts_content = self.drive_manager.read_file(scripts_filename, channel_folder_id)
-            if scripts_content:
-                backup_scripts = f"backup_scripts_{channel_name.lower()}_{timestamp}.txt"
-                self.drive_manager.write_file(backup_scripts, scripts_content, backup_folder_id)
-            
+            lowered = channel_name.lower()
+
+            # Resolve both source files in one batched round-trip
+            titles_filename, scripts_filename = self._channel_filenames(channel_name)
+            file_ids = self.drive_manager.batch_find_file_ids([
+                (titles_filename, channel_folder_id),
+                (scripts_filename, channel_folder_id),
+            ])
+
+            # Backups are server-side copies: the file bytes never get
+            # downloaded and re-uploaded through this process
+            titles_id = file_ids.get((titles_filename, channel_folder_id))
+            if titles_id:
+                backup_titles = f"backup_titles_{lowered}_{timestamp}.txt"
+                self.drive_manager.copy_file(titles_id, backup_titles, backup_folder_id)
+
+            scripts_id = file_ids.get((scripts_filename, channel_folder_id))
+            if scripts_id:
+                backup_scripts = f"backup_scripts_{lowered}_{timestamp}.txt"
+                self.drive_manager.copy_file(scripts_id, backup_scripts, backup_folder_id)
+
             return True
         except AttributeError as e:
-            st.warning(f"Backup service not available (missing attribute): {str(e)}")
+            if not quiet:
+                st.warning(f"Backup service not available (missing attribute): {str(e)}")
             return False
         except Exception as e:
-            st.error(f"Failed to backup {channel_name}: {str(e)}")
+            if not quiet:
+                st.error(f"Failed to backup {channel_name}: {str(e)}")
             return False
 
 
+@st.cache_resource(ttl=300, show_spinner=False)
+def _load_channels_cached(folder_id: str, _drive_manager) -> Optional[Dict[str, str]]:
+    """Parsed channels.json, shared across sessions for up to five minutes.
+
+    Keyed by folder_id; the manager itself is excluded from the cache key
+    (leading underscore). Returns None when the file doesn't exist yet.
+    save_channels clears this so edits show up immediately.
+    """
+    content = _drive_manager.read_file("channels.json")
+    if not content or not content.strip():
+        return None
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content.strip())
+
+
+@st.cache_resource(show_spinner=False)
+def get_claude_client() -> ClaudeClient:
+    """Shared Claude client so HTTP setup happens once, not per session."""
+    return ClaudeClient()
+
+
+@st.cache_resource(show_spinner=False)
+def get_drive_manager() -> GoogleDriveManager:
+    """Shared Drive connection across sessions.
+
+    authenticate() and the app-folder lookup are two Drive round-trips;
+    caching the manager means they run once per process instead of once
+    per browser session.
+    """
+    return GoogleDriveManager()
+
+
+@st.cache_resource(show_spinner=False)
+def get_channel_manager() -> ChannelManager:
+    """Shared channel manager (and its Drive connection) across sessions."""
+    return ChannelManager(get_drive_manager())
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for background Drive work (backups,
+    prefetches). Created once instead of spinning up fresh threads on
+    every rerun that needs them."""
+    return ThreadPoolExecutor(max_workers=8)
+
+
+@functools.lru_cache(maxsize=100_000)
+def _extract_movie(title: str):
+    """Memoized extract_movie_and_fact - historical titles never change, so
+    re-parsing them on every generation is pure recomputation."""
+    return SimilarityChecker.extract_movie_and_fact(title)
+
+
+def _titles_version(channel: str) -> int:
+    """Current version counter for a channel's used-titles set."""
+    return st.session_state.setdefault('titles_version', {}).get(channel, 0)
+
+
+def _bump_titles_version(channel: str):
+    """Invalidate the cached used-titles set after a real mutation."""
+    versions = st.session_state.setdefault('titles_version', {})
+    versions[channel] = versions.get(channel, 0) + 1
+
+
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
+def _cached_used_titles(channel: str, version: int) -> Set[str]:
+    """Fetch used titles once per (channel, version).
+
+    The version is bumped only when a title is actually added or removed,
+    so backing storage is read once per real mutation instead of once per
+    loop iteration during generation. The ttl bounds staleness if another
+    process mutates the file, and max_entries keeps superseded versions
+    from accumulating.
+    """
+    return st.session_state.channel_manager.get_used_titles(channel, force_refresh=True)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def extract_movies_batch(titles: tuple) -> frozenset:
+    """Extract movie names (with years) from a batch of titles.
+
+    Pure function of its input, so repeated generations in the same session
+    reuse the parse instead of re-running the extraction per title.
+    """
+    return frozenset(
+        m for m in (_extract_movie(t)[0] for t in titles) if m
+    )
+
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def _build_exclusion_prompt(channel: str, version: int, base_prompt: str) -> str:
+    """Assemble the exclusion prompt for a channel's current titles.
+
+    Keyed on the titles version, so the join over potentially hundreds of
+    titles runs once per real mutation instead of once per generate click.
+    The ttl/max_entries bound the cache on this long-lived process -
+    superseded versions hold multi-KB prompts and would otherwise pile up.
+    The caller appends any extra prompt afterwards so it never taints the
+    cache.
+    """
+    used_titles_list = list(_cached_used_titles(channel, version))
+    if not used_titles_list:
+        return base_prompt
+
+    # Calculate how many titles we can fit in ~4k tokens
+    # Rough estimate: prompt overhead ~500 tokens, leaving 3500 for titles
+    # Average title ~20 tokens, so we can fit ~175 titles
+    max_titles_for_tokens = 175
+
+    # Send the most recent titles (most likely to be duplicated)
+    if len(used_titles_list) > max_titles_for_tokens:
+        titles_to_send = used_titles_list[-max_titles_for_tokens:]  # Most recent 175
+        all_existing_titles = "\n".join(titles_to_send)
+        titles_note = f" (Recent {len(titles_to_send)} of {len(used_titles_list)} total)"
+    else:
+        all_existing_titles = "\n".join(used_titles_list)
+        titles_note = ""
+
+    # Create exclusion prompt (optimized for token usage)
+    exclusion_text = EXCLUSION_TMPL.substitute(
+        titles_note=titles_note,
+        all_existing_titles=all_existing_titles
+    )
+    return f"{exclusion_text}\n\n{base_prompt}"
+
+
+# Matches "TITLE: ...", "TITLE ..." or "TITLE<symbol>..." and captures the
+# rest of the line; a bare "TITLE" line deliberately doesn't match (the
+# actual title follows on the next line, handled by the fallback pass)
+_TITLE_LINE_RE = re.compile(r'^TITLE(?::\s*|\s+|(?=[^A-Za-z]))(.+)$', re.IGNORECASE)
+
+# Leading list decorations like "1. ", "- ", "3 - "
+_LEADING_JUNK_RE = re.compile(r'^[\d\-\.\s]+')
+
+# A line that is exactly "TITLE" or "TITLE:" - the real title follows on
+# the next line (fallback pass)
+_BARE_TITLE_RE = re.compile(r'TITLE:?', re.IGNORECASE)
+
+
 def extract_titles_from_response(content: str) -> List[str]:
     """Extract ALL titles from the AI response."""
     titles_found = []
     lines = content.split('\n')
-    
+
     for line in lines:
         line = line.strip()
-        
+
         # Remove markdown bold formatting if present
         if line.startswith('**') and line.endswith('**'):
             line = line[2:-2].strip()
-        
+
         # Look for "TITLE:" or "TITLE" format (case insensitive)
-        line_upper = line.upper()
-        if line_upper.startswith('TITLE:'):
-            # Extract everything after "TITLE:"
-            title = line[6:].strip()  # Remove "TITLE:" and whitespace
-        elif line_upper.startswith('TITLE '):
-            # Extract everything after "TITLE "
-            title = line[6:].strip()  # Remove "TITLE " and whitespace
-        elif line_upper.startswith('TITLE') and len(line) > 5 and not line[5].isalpha():
-            # Handle "TITLE" followed by non-letter (like numbers, symbols)
-            title = line[5:].strip()
-        elif line_upper == 'TITLE':
-            # Handle standalone "TITLE" on one line (title might be on next line)
-            continue  # Skip this line, title should be on next line
-        else:
-            # Check if previous line was just "TITLE" or "**TITLE**"
+        match = _TITLE_LINE_RE.match(line)
+        if not match:
             continue
-            
+        title = match.group(1).strip()
+
         # Clean up the title - remove any remaining markdown formatting
         title = title.replace('**', '').strip()
-        
+
         # Clean up the title
         if title.endswith(' SHORT'):
             title = title[:-6].strip()
-        
+
         # Remove any leading numbers/dots/dashes (like "1. ", "- ", etc.)
-        title = re.sub(r'^[\d\-\.\s]+', '', title).strip()
-        
+        title = _LEADING_JUNK_RE.sub('', title).strip()
+
         if title and len(title) > 5:  # Minimum length check
             titles_found.append(title)
     
@@ -825,14 +1422,14 @@ def extract_titles_from_response(content: str) -> List[str]:
         if line.startswith('**') and line.endswith('**'):
             line = line[2:-2].strip()
         
-        if line.upper() == 'TITLE' or line.upper() == 'TITLE:':
+        if _BARE_TITLE_RE.fullmatch(line):
             # Get the next line as the title
             next_line = lines[i + 1].strip()
             # Remove markdown from next line too
             next_line = next_line.replace('**', '').strip()
             
             # Remove any leading numbers/dots/dashes
-            next_line = re.sub(r'^[\d\-\.\s]+', '', next_line).strip()
+            next_line = _LEADING_JUNK_RE.sub('', next_line).strip()
             
             if next_line and len(next_line) > 5 and next_line not in titles_found:
                 titles_found.append(next_line)
@@ -855,6 +1452,545 @@ def clear_all_modals():
             del st.session_state[key]
 
 
+@st.fragment
+def _clear_confirm_dialog(kind: str, selected_channel: str):
+    """Shared confirmation dialog for the destructive clear actions.
+
+    kind is "titles" or "scripts" and selects the session key, labels, and
+    manager method. Runs as a fragment so toggling the checkboxes reruns
+    just the dialog; only the final clear/cancel actions trigger a full
+    rerun.
+    """
+    label = kind.capitalize()
+    session_key = f"clear_{kind}_confirm"
+
+    st.markdown("---")
+    with st.expander(f"⚠️ **CONFIRM: Clear All {label}**", expanded=True):
+        st.error(f"**WARNING:** This will delete ALL {kind} for {selected_channel}!")
+        st.write("This action cannot be undone (but a backup will be created first).")
+
+        # Two deliberate checkboxes before the button unlocks
+        confirm1 = st.checkbox(f"I understand this will delete all {kind}", key=f"clear_{kind}_confirm1")
+        confirm2 = st.checkbox(f"I really want to delete all {kind}", key=f"clear_{kind}_confirm2")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button(f"🗑️ Yes, Clear All {label}", type="primary", disabled=not (confirm1 and confirm2)):
+                # Backup runs synchronously so the server-side copies are
+                # guaranteed to capture the pre-clear content - after the
+                # batched lookups this is only a few Drive round-trips
+                with st.spinner("Creating backup..."):
+                    backed_up = st.session_state.channel_manager.backup_channel_files(selected_channel)
+                if not backed_up:
+                    st.error(f"❌ Backup failed - {kind} were NOT cleared. Try again or cancel.")
+                else:
+                    clear_action = getattr(st.session_state.channel_manager, f"clear_{kind}")
+                    if clear_action(selected_channel):
+                        st.success(f"✅ All {kind} cleared for {selected_channel}")
+                        del st.session_state[session_key]
+                        st.rerun(scope="app")
+
+        with col2:
+            if st.button("❌ Cancel", key=f"cancel_clear_{kind}"):
+                del st.session_state[session_key]
+                st.rerun(scope="app")
+
+
+@st.fragment
+def _generation_panel(selected_channel: str, user_role: str):
+    """Script-generation form and result display.
+
+    Runs as a fragment so form submits and the admin debug toggles
+    rerun only this panel instead of the whole script - the sidebar
+    and the title-management sections above it are skipped entirely.
+    """
+    # Script generation
+    st.subheader("🎯 Generate New Scripts")
+
+    # Debug toggle lives outside the submit-gated block below so its state
+    # survives reruns - created there, it would be discarded by widget
+    # cleanup on every non-submit rerun and could never read back True
+    if user_role == 'admin':
+        st.checkbox("🔍 Show AI prompt debug (Admin Only)", key="show_debug_prompt")
+
+    # Form batches the inputs so typing in the extra prompt doesn't
+    # rerun the whole script on every keystroke - only on submit
+    with st.form("generate_form"):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            extra_prompt = st.text_input("Extra prompt (optional):", help="Add any specific instructions for this generation")
+        with col2:
+            num_scripts = st.number_input("🔢 Number of scripts:", min_value=1, max_value=10, value=1, step=1, help="Generate 1-10 scripts at once")
+            parallel_mode = st.checkbox(
+                "⚡ Fast mode",
+                value=False,
+                help="Generate all scripts at the same time with the same exclusion list. Much faster for batches, but relies on the duplicate filter to catch repeated movies afterwards."
+            )
+
+        generate_button = st.form_submit_button(
+            "🚀 Generate Scripts",
+            type="primary"
+        )
+
+    # Process generation only when the form is submitted
+    if generate_button:
+        try:
+            n_scripts = int(num_scripts)
+            with st.spinner(f"🎬 Generating {n_scripts} script{'s' if n_scripts > 1 else ''}... This may take {10 * n_scripts}-{30 * n_scripts} seconds..."):
+                try:
+                    # Try with force_refresh first, fallback without it if there's an error
+                    try:
+                        used_titles = _cached_used_titles(selected_channel, _titles_version(selected_channel))
+                    except TypeError:
+                        # Fallback for old method signature - refresh channel manager
+                        st.warning("Refreshing channel manager...")
+                        get_channel_manager.clear()
+                        st.session_state.channel_manager = get_channel_manager()
+                        used_titles = _cached_used_titles(selected_channel, _titles_version(selected_channel))
+                    
+                    # Debug: Show how many titles we're excluding
+                    if user_role == 'admin':
+                        st.info(f"📊 Loading exclusion list: Found {len(used_titles)} existing titles for {selected_channel}")
+                except Exception as titles_error:
+                    st.error(f"❌ Error loading titles: {str(titles_error)}")
+                    used_titles = set()  # Continue with empty set
+                
+                # Build exclusion list
+                base_prompt = st.session_state.channel_manager.get_channel_prompt(selected_channel)
+                used_titles_list = list(used_titles)
+
+                # Extract complete movie names with years (cached per titles batch)
+                used_movies_with_years = set(extract_movies_batch(tuple(used_titles_list)))
+                if used_titles_list:
+                    st.session_state.last_loaded_titles = used_titles_list
+
+                # Exclusion prompt assembly is memoized on the titles
+                # version, so repeat clicks with an unchanged title file
+                # skip the join over hundreds of titles
+                if used_titles:
+                    full_prompt = _build_exclusion_prompt(
+                        selected_channel, _titles_version(selected_channel), base_prompt
+                    )
+                else:
+                    # No existing titles to exclude
+                    full_prompt = base_prompt
+
+                if extra_prompt.strip():
+                    full_prompt += " " + extra_prompt.strip()
+                
+                # Debug: Show admin what the AI is receiving (for troubleshooting).
+                # Gated behind the checkbox above the form so the (possibly tens
+                # of KB) prompt text is only sent to the browser on request.
+                if user_role == 'admin' and st.session_state.get('show_debug_prompt', False):
+                    with st.expander("🔍 **DEBUG: View AI Prompt** (Admin Only)", expanded=True):
+                        st.text_area("Full prompt sent to AI:", value=full_prompt, height=200, disabled=True)
+                        if used_titles:
+                            st.write(f"**Total titles in Google Drive file:** {len(used_titles)}")
+                            # Show sample of actual titles being passed
+                            with st.expander("View sample from Google Drive file", expanded=False):
+                                sample_lines = [f"{i}. {title}" for i, title in enumerate(islice(used_titles, 15), 1)]
+                                if len(used_titles) > 15:
+                                    sample_lines.append(f"... and {len(used_titles) - 15} more titles in file")
+                                st.caption("  \n".join(sample_lines))
+                        # Calculate and show prompt size
+                        prompt_length = len(full_prompt)
+                        estimated_tokens = prompt_length / 4  # Rough estimate: 1 token ≈ 4 characters
+                        st.write(f"**Prompt length:** {prompt_length:,} characters (≈{int(estimated_tokens):,} tokens)")
+                
+                # Generate multiple scripts
+                all_generated_scripts = []
+                total_added = 0
+                total_blocked = 0
+                session_used_movies = set()  # Track movies used in THIS session
+
+                # Prompt fragments that are identical for every script in the
+                # batch - build them once instead of per iteration
+                stripped_extra = extra_prompt.strip()
+                # Reminder baked in once per distinct prompt here instead of
+                # re-appended (and re-allocated) inside the loop
+                full_prompt_reminded = f"{full_prompt}\n\n{FINAL_REMINDER}"
+
+                # Fast mode: issue all API calls at once with the initial
+                # exclusion prompt. The network round-trips overlap instead of
+                # serializing; any duplicates the model produces across the
+                # batch are still caught by the per-title check below.
+                # Pre-generate every session ID for the batch in one RNG call
+                # instead of hitting uuid4() inside the hot loop; .hex skips
+                # the dashed-string formatting pass of str()
+                raw_ids = os.urandom(16 * n_scripts)
+                session_ids = [
+                    uuid.UUID(bytes=raw_ids[i * 16:(i + 1) * 16], version=4).hex
+                    for i in range(n_scripts)
+                ]
+
+                parallel_results = None
+                if parallel_mode and n_scripts > 1:
+                    batch_results = st.session_state.claude_client.generate_batch(
+                        [full_prompt_reminded] * n_scripts, session_ids
+                    )
+                    parallel_results = list(zip(session_ids, batch_results))
+
+                # Rebuilt exclusion prompts are reused across no-progress
+                # iterations (same title count -> same exclusion list)
+                last_prompt_titles_count = -1
+                cached_updated_prompt = None
+
+                for script_num in range(n_scripts):
+                    st.write(f"🔄 Generating script {script_num + 1} of {n_scripts}...")
+
+                    # REBUILD prompt for each generation with UPDATED complete titles file
+                    if parallel_results is not None:
+                        # Fast mode already generated everything with the batch prompt
+                        script_prompt = full_prompt_reminded
+                    elif script_num > 0 and len(used_titles_list) == last_prompt_titles_count and cached_updated_prompt:
+                        # Previous script added nothing, so the exclusion list is
+                        # identical - skip the rebuild entirely
+                        script_prompt = cached_updated_prompt
+                    elif script_num > 0:
+                        # used_titles_list is kept current locally: titles accepted
+                        # by earlier scripts in this batch are appended as they are
+                        # saved, so there is nothing to re-read from Drive here.
+
+                        # Get updated titles optimized for ~4k tokens
+                        max_titles_for_tokens = 175  # ~3500 tokens for titles
+                        
+                        if len(used_titles_list) > max_titles_for_tokens:
+                            titles_to_send = used_titles_list[-max_titles_for_tokens:]  # Most recent
+                            all_existing_titles = "\n".join(titles_to_send)
+                            titles_note = f" ({len(titles_to_send)} recent of {len(used_titles_list)} total)"
+                        else:
+                            all_existing_titles = "\n".join(used_titles_list)
+                            titles_note = ""
+                        
+                        # Create updated exclusion prompt (optimized for tokens)
+                        exclusion_text = UPDATED_EXCLUSION_TMPL.substitute(
+                            titles_note=titles_note,
+                            script_num=script_num,
+                            all_existing_titles=all_existing_titles
+                        )
+                        # Combine with user's instructions in one join instead of
+                        # growing the string with repeated concatenation
+                        prompt_parts = [exclusion_text, base_prompt]
+                        if stripped_extra:
+                            prompt_parts.append("Additional instructions: " + stripped_extra)
+                        prompt_parts.append(MOVIE_RULES_TAIL)
+                        # Reminder kept brief for token efficiency
+                        prompt_parts.append(FINAL_REMINDER)
+                        script_prompt = "\n\n".join(prompt_parts)
+                        last_prompt_titles_count = len(used_titles_list)
+                        cached_updated_prompt = script_prompt
+                    else:
+                        # First script uses original prompt
+                        script_prompt = full_prompt_reminded
+
+                    # Debug: Show the ACTUAL prompt being sent for THIS script
+                    if user_role == 'admin':
+                        with st.expander(f"🔍 **DEBUG: Full Prompt for Script {script_num + 1}** (Admin Only)", expanded=False):
+                            st.text_area(f"Exact prompt being sent to AI for script {script_num + 1}:", 
+                                       value=script_prompt, height=300, disabled=True, 
+                                       key=f"debug_prompt_{script_num}")
+                            # Show stats
+                            prompt_length = len(script_prompt)
+                            estimated_tokens = prompt_length / 4
+                            st.write(f"**Prompt length:** {prompt_length:,} characters (≈{int(estimated_tokens):,} tokens)")
+                            
+                            # Show titles count
+                            if 'used_titles_list' in locals():
+                                st.write(f"**Total titles in Google Drive file:** {len(used_titles_list)}")
+                                with st.expander("View sample titles from file", expanded=False):
+                                    sample_lines = [f"{i}. {title}" for i, title in enumerate(used_titles_list[:20], 1)]
+                                    if len(used_titles_list) > 20:
+                                        sample_lines.append(f"... and {len(used_titles_list) - 20} more")
+                                    st.caption("  \n".join(sample_lines))
+                            
+                            if script_num > 0:
+                                st.write(f"**Movies added this session:** {len(session_used_movies)}")
+                                if session_used_movies:
+                                    st.caption("Session movies: " + ", ".join(list(session_used_movies)[:5]))
+                    
+                    # Retry logic for when AI uses banned movies
+                    max_retries = 3
+                    retry_count = 0
+                    script_generated = False
+
+                    # One snapshot per script: nothing else writes between
+                    # retries, so re-fetching inside the retry loop is wasted
+                    # work. The index buckets titles by movie so each check
+                    # only scans entries that can actually collide.
+                    current_titles = _cached_used_titles(selected_channel, _titles_version(selected_channel))
+                    title_index = SimilarityChecker.build_index(current_titles)
+
+
+                    while retry_count < max_retries and not script_generated:
+                        try:
+                            if parallel_results is not None:
+                                session_id, result = parallel_results[script_num]
+                            else:
+                                session_id = session_ids[script_num]
+                                if n_scripts == 1:
+                                    # Single script: stream tokens into the page as
+                                    # they arrive instead of blocking for the whole
+                                    # response - same total time, much better
+                                    # perceived latency
+                                    try:
+                                        streamed = st.write_stream(
+                                            st.session_state.claude_client.generate_script_stream(
+                                                script_prompt, session_id
+                                            )
+                                        )
+                                        result = {"success": True, "content": streamed, "session_id": session_id}
+                                    except Exception:
+                                        # Buffered path owns retries; use it on any
+                                        # streaming failure
+                                        result = st.session_state.claude_client.generate_script(script_prompt, session_id)
+                                else:
+                                    result = st.session_state.claude_client.generate_script(script_prompt, session_id)
+                        except Exception as api_error:
+                            st.error(f"❌ API Error for script {script_num + 1}: {str(api_error)}")
+                            break
+                        
+                        if result["success"]:
+                            # Initialize variables to ensure they're always defined
+                            content = result.get("content", "No content available")
+                            titles = []
+                            
+                            try:
+                                # Extract and save titles
+                                titles = extract_titles_from_response(content)
+                                
+                                # Debug: Show what titles were found
+                                if user_role == 'admin':
+                                    st.info(f"🔍 Debug: Extracted {len(titles)} titles from script {script_num + 1}")
+                                
+                                # PRE-CHECK: See if AI used a movie from the Google Drive file
+                                will_be_blocked = False
+                                blocked_movie = None
+
+                                for title in titles:
+                                    # Check if this title would be blocked as a duplicate
+                                    is_dup, reason = SimilarityChecker.is_duplicate_title_indexed(title, title_index)
+                                    if is_dup:
+                                        will_be_blocked = True
+                                        movie, _ = _extract_movie(title)
+                                        blocked_movie = movie if movie else title
+                                        if retry_count == 0:
+                                            st.warning(f"⚠️ AI tried to use: {blocked_movie} (Reason: {reason})")
+                                        break
+                                
+                                # If AI used a movie from the file, retry with stronger prompt
+                                # (sequential mode only - fast mode responses are pre-fetched)
+                                if will_be_blocked and retry_count < max_retries - 1 and parallel_results is None:
+                                    retry_count += 1
+                                    st.warning(f"🔄 Retrying script {script_num + 1} (attempt {retry_count + 1}/{max_retries}) - AI used a movie from the Google Drive file")
+                                    
+                                    # Rebuild prompt with REJECTION notice at the top,
+                                    # written into one buffer instead of chained +=
+                                    buf = io.StringIO()
+                                    buf.write("❌❌❌ YOUR PREVIOUS ATTEMPT WAS REJECTED ❌❌❌\n\n")
+                                    buf.write(f"You tried to use '{blocked_movie}' which is already in my Google Drive file!\n")
+                                    buf.write("DO NOT use ANY movie from the Google Drive file.\n")
+                                    buf.write("Pick a COMPLETELY DIFFERENT movie that is NOT in the file.\n\n")
+                                    # Prepend rejection notice to original prompt (not doubling it)
+                                    buf.write(script_prompt)
+                                    script_prompt = buf.getvalue()
+                                    continue
+                                
+                                # If not blocked or max retries reached, proceed
+                                added_count = 0
+                                blocked_titles = []
+                                titles_to_add = []
+
+                                # Check against the snapshot fetched for the pre-check
+                                # above; nothing else can write between two iterations
+                                # of this loop, so re-fetching per title is wasted I/O.
+                                debug_lines = []
+                                # Bulk check against the per-script index; accepted
+                                # titles join the index so intra-script duplicates
+                                # are still caught
+                                dup_results = SimilarityChecker.is_duplicate_bulk(titles, title_index)
+                                for title, (is_dup, reason) in zip(titles, dup_results):
+                                    try:
+                                        if not is_dup:
+                                            titles_to_add.append(title)
+                                        else:
+                                            blocked_titles.append((title, reason))
+                                            total_blocked += 1
+                                            if user_role == 'admin':
+                                                debug_lines.append(f"🚫 Blocked title: {title} (Reason: {reason})")
+
+                                            # If ALL titles from this script were blocked, show warning
+                                            if len(blocked_titles) == len(titles) and len(titles) > 0:
+                                                st.error(f"⚠️ Script {script_num + 1}: All titles were duplicates! The AI ignored the Google Drive file.")
+                                    except Exception as title_error:
+                                        st.error(f"❌ Failed to process title '{title}': {str(title_error)}")
+
+                                # One batched Drive write per script instead of one per
+                                # title; bulk_add_titles also re-filters intra-batch dups
+                                if titles_to_add:
+                                    try:
+                                        added_count, batch_dups = st.session_state.channel_manager.bulk_add_titles(
+                                            selected_channel, titles_to_add
+                                        )
+                                        total_blocked += batch_dups
+                                        # Keep the local exclusion list current for the
+                                        # next script's prompt rebuild
+                                        used_titles_list.extend(titles_to_add)
+                                        for title in titles_to_add:
+                                            # Track movie for this session
+                                            movie, _ = _extract_movie(title)
+                                            if movie:
+                                                session_used_movies.add(movie)
+                                        if user_role == 'admin':
+                                            debug_lines.extend(f"✅ Saved title: {title}" for title in titles_to_add)
+                                    except Exception as title_error:
+                                        st.error(f"❌ Failed to save titles for script {script_num + 1}: {str(title_error)}")
+
+                                # One code block per script instead of one caption
+                                # widget (and frontend message) per title
+                                if user_role == 'admin' and debug_lines:
+                                    st.code("\n".join(debug_lines))
+
+                                # Save script
+                                try:
+                                    user_name = get_current_user().get('first_name', 'Unknown User')
+                                    st.session_state.channel_manager.save_script(selected_channel, content, session_id, user_name)
+                                except Exception as script_error:
+                                    st.error(f"❌ Failed to save script {script_num + 1}: {str(script_error)}")
+                                
+                                # Store script info
+                                script_info = {
+                                    "script_number": script_num + 1,
+                                    "content": content,
+                                    # Counted once here so rendering never has to
+                                    # re-split the full script text
+                                    "word_count": len(content.split()),
+                                    "char_count": len(content),
+                                    # Tuples: these are retained for the whole page
+                                    # render, so keep them immutable and compact
+                                    "titles": tuple(titles),
+                                    "added_titles": added_count,
+                                    "blocked_titles": tuple(blocked_titles),
+                                    "session_id": session_id,
+                                    "token_usage": result.get('token_usage', {})
+                                }
+                                all_generated_scripts.append(script_info)
+                                total_added += added_count
+                                script_generated = True  # Mark as successful
+                                
+                            except Exception as processing_error:
+                                st.error(f"❌ Error processing script {script_num + 1}: {str(processing_error)}")
+                                script_generated = True  # Still mark as done to avoid infinite loop
+                        else:
+                            st.error(f"❌ Script {script_num + 1} generation failed: {result.get('error', 'Unknown error')}")
+                            break  # Exit retry loop on API failure
+                
+                # Display overall results
+                if all_generated_scripts:
+                    # Calculate success metrics
+                    total_scripts = len(all_generated_scripts)
+                    success_rate = (total_added / total_scripts * 100) if total_scripts > 0 else 0
+                    duplicate_rate = (total_blocked / total_scripts * 100) if total_scripts > 0 else 0
+                    
+                    # Determine quality rating
+                    if duplicate_rate == 0:
+                        quality_msg = "🏆 **PERFECT!** Zero duplicates - 100% unique content!"
+                        quality_color = "success"
+                    elif duplicate_rate <= 20:
+                        quality_msg = "🎯 **EXCELLENT!** Very low duplicate rate!"
+                        quality_color = "success"
+                    elif duplicate_rate <= 40:
+                        quality_msg = "👍 **GOOD!** Acceptable duplicate rate!"
+                        quality_color = "info"
+                    else:
+                        quality_msg = "⚠️ **NEEDS IMPROVEMENT** - Consider using more diverse movies"
+                        quality_color = "warning"
+                    
+                    # Display comprehensive statistics
+                    st.success(f"✅ Generated {total_scripts} script{'s' if total_scripts > 1 else ''}!")
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("✅ Unique Titles Added", total_added)
+                    with col2:
+                        st.metric("🚫 Duplicates Blocked", total_blocked)
+                    with col3:
+                        st.metric("📊 Success Rate", f"{success_rate:.0f}%")
+                    
+                    # Show quality assessment
+                    if quality_color == "success":
+                        st.success(quality_msg)
+                    elif quality_color == "info":
+                        st.info(quality_msg)
+                    else:
+                        st.warning(quality_msg)
+                
+                # One summary table for the batch instead of three st.metric
+                # widgets per script (each widget is its own frontend message)
+                if len(all_generated_scripts) > 1:
+                    st.dataframe(
+                        [
+                            {
+                                "Script": s["script_number"],
+                                "Total Titles": len(s["titles"]),
+                                "Added": s["added_titles"],
+                                "Blocked": len(s["blocked_titles"]),
+                            }
+                            for s in all_generated_scripts
+                        ],
+                        use_container_width=True,
+                        hide_index=True,
+                    )
+
+                # Display each script
+                for script_info in all_generated_scripts:
+                    script_num = script_info["script_number"]
+                    content = script_info["content"]
+                    titles = script_info["titles"]
+                    added_count = script_info["added_titles"]
+                    blocked_titles = script_info["blocked_titles"]
+                    session_id = script_info["session_id"]
+
+                    st.markdown("---")
+                    st.subheader(f"📄 Script #{script_num}")
+
+                    # Show title statistics for this script
+                    st.caption(f"📊 {len(titles)} titles • {added_count} added • {len(blocked_titles)} blocked")
+
+                    # Show blocked titles with reasons
+                    if blocked_titles:
+                        with st.expander(f"🚫 Blocked Titles for Script #{script_num} ({len(blocked_titles)})", expanded=False):
+                            # One markdown message instead of two widgets
+                            # per blocked title
+                            st.markdown("\n\n".join(
+                                f"❌ **{blocked_title}**  \n*Reason: {reason}*"
+                                for blocked_title, reason in blocked_titles
+                            ))
+                    
+                    # Show accepted titles (hash lookup instead of scanning
+                    # blocked_titles once per title)
+                    blocked_set = {bt[0] for bt in blocked_titles}
+                    accepted_titles = [title for title in titles if title not in blocked_set]
+                    if accepted_titles:
+                        with st.expander(f"✅ Added Titles for Script #{script_num} ({len(accepted_titles)})", expanded=False):
+                            st.markdown("\n".join(f"{i}. {title}" for i, title in enumerate(accepted_titles, 1)))
+                    
+                    # Show script content
+                    with st.expander(f"📜 View Script #{script_num} Content", expanded=len(all_generated_scripts) == 1):
+                        st.text_area(
+                            f"Script #{script_num} Content:",
+                            value=content,
+                            height=400,
+                            disabled=True,
+                            key=f"script_{session_id}"
+                        )
+                        
+                        if content:
+                            st.caption(f"📊 {script_info['word_count']} words, {script_info['char_count']} characters")
+                
+        except Exception as e:
+            st.error(f"❌ Outer error: {str(e)}")
+
+
 def main():
     """Main Streamlit application."""
     
@@ -872,27 +2008,31 @@ def main():
             clear_all_modals()
             st.session_state.modals_cleared_on_login = True
         
-        # Initialize session state
+        # Initialize session state from the shared cached resources
         if 'drive_manager' not in st.session_state:
             try:
-                st.session_state.claude_client = ClaudeClient()
-                
-                # Try to initialize Google Drive
+                st.session_state.claude_client = get_claude_client()
+
+                # Try to initialize Google Drive (shared across sessions)
                 try:
-                    st.session_state.drive_manager = GoogleDriveManager()
+                    st.session_state.channel_manager = get_channel_manager()
+                    st.session_state.drive_manager = st.session_state.channel_manager.drive_manager
                 except Exception as drive_error:
                     st.warning(f"Google Drive initialization warning: {str(drive_error)}")
                     st.info("Some features may be limited. Channels will use local storage.")
-                    # Create a dummy drive manager for fallback
                     st.session_state.drive_manager = None
-                
-                # Initialize channel manager (will work even if Drive fails)
-                if st.session_state.drive_manager:
-                    st.session_state.channel_manager = ChannelManager(st.session_state.drive_manager)
-                else:
+
+                if not st.session_state.drive_manager or not st.session_state.drive_manager.service:
+                    # Don't keep a failed Drive connection cached for other sessions
+                    get_channel_manager.clear()
+                    get_drive_manager.clear()
                     st.error("Google Drive not available. Please check credentials.")
                     return
-                    
+
+                # Warm every channel's titles in the background while the
+                # user is still picking one - the reads overlap on the pool
+                st.session_state.channel_manager.prefetch_all_titles()
+
             except Exception as e:
                 st.error(f"Failed to initialize services: {str(e)}")
                 st.info("Please check if all secrets are configured correctly.")
@@ -930,24 +2070,48 @@ def main():
     if 'last_backup' not in st.session_state:
         st.session_state.last_backup = {}
     
-    # Check if backup is needed for each channel (only if channel_manager exists)
-    if 'channel_manager' in st.session_state and st.session_state.channel_manager:
+    # Check if backup is needed for each channel (only if channel_manager
+    # exists). Reruns fire on every widget interaction but the schedule has
+    # 3-hour granularity, so throttle the scan to once a minute per session.
+    _backup_check_due = time.monotonic() - st.session_state.get('_last_backup_check', 0.0) > 60
+    if _backup_check_due and 'channel_manager' in st.session_state and st.session_state.channel_manager:
+        st.session_state['_last_backup_check'] = time.monotonic()
         try:
+            # One clock read for the whole scan - every channel is compared
+            # against the same instant
+            now = datetime.now()
+            # Precomputed due times: the hot check is one dict lookup and one
+            # comparison per channel instead of subtraction arithmetic
+            next_backup_at = st.session_state.setdefault('next_backup_at', {})
+            channels_needing_backup = []
             for channel_name in st.session_state.channel_manager.get_channel_names():
-                # For new channels, set backup time to now (so next backup is in 3 hours)
-                last_backup_time = st.session_state.last_backup.get(channel_name, datetime.now())
-                
-                # Check if 3 hours have passed since last backup
-                time_since_backup = datetime.now() - last_backup_time
-                if time_since_backup > timedelta(hours=3):
-                    # Show admin that auto-backup is happening
-                    if user_role == 'admin':
-                        st.info(f"🔄 Auto-backup running for {channel_name}...")
-                    
-                    # Perform backup
+                # For new channels, schedule the first backup 3 hours out
+                if now >= next_backup_at.setdefault(channel_name, now + BACKUP_INTERVAL):
+                    channels_needing_backup.append(channel_name)
+
+            if channels_needing_backup:
+                # Show admin that auto-backup is happening
+                if user_role == 'admin':
+                    st.info(f"🔄 Auto-backup running for: {', '.join(channels_needing_backup)}...")
+
+                # Backups are independent and network-bound, so overlap them
+                # on the shared pool instead of spawning threads per rerun.
+                # Workers run quiet - st.* calls need the script context,
+                # which worker threads don't have.
+                pool = get_executor()
+                futures = {
+                    channel_name: pool.submit(
+                        st.session_state.channel_manager.backup_channel_files,
+                        channel_name, True
+                    )
+                    for channel_name in channels_needing_backup
+                }
+
+                for channel_name, future in futures.items():
                     try:
-                        if st.session_state.channel_manager.backup_channel_files(channel_name):
-                            st.session_state.last_backup[channel_name] = datetime.now()
+                        if future.result():
+                            st.session_state.last_backup[channel_name] = now
+                            next_backup_at[channel_name] = now + BACKUP_INTERVAL
                             if user_role == 'admin':
                                 st.success(f"✅ Auto-backup completed for {channel_name}")
                         else:
@@ -960,10 +2124,12 @@ def main():
             # Silent fail for auto-backup, but log for admin
             if user_role == 'admin':
                 st.error(f"❌ Auto-backup system error: {str(e)}")
-    
+
     # Sidebar for channel management
     with st.sidebar:
         st.header("📁 Channel Management")
+        # Single wall-clock instant for all the timer math below
+        now = datetime.now()
         
         # Refresh channels
         if st.button("🔄 Refresh Channels", key="refresh_channels_button"):
@@ -983,21 +2149,32 @@ def main():
         channels = st.session_state.channel_manager.get_channel_names()
         if channels:
             selected_channel = st.selectbox("Select Channel", channels, key="selected_channel")
-            
+
+            # Read ahead on selection: warm the channel's Drive caches in the
+            # background so the first generate/save click doesn't pay the
+            # read round-trips inline. Prompts live in the in-memory
+            # channels dict and need no prefetch.
+            if selected_channel and st.session_state.get('prefetched_channel') != selected_channel:
+                st.session_state.prefetched_channel = selected_channel
+                get_executor().submit(
+                    st.session_state.channel_manager.prefetch_channel_files,
+                    selected_channel
+                )
+
             # Show backup timer for all channels (admin only)
             if user_role == 'admin':
                 if selected_channel:
                     # Show timer for selected channel
                     last_backup = st.session_state.last_backup.get(selected_channel)
                     if last_backup:
-                        time_since = datetime.now() - last_backup
+                        time_since = now - last_backup
                         hours = int(time_since.total_seconds() / 3600)
                         minutes = int((time_since.total_seconds() % 3600) / 60)
                         st.caption(f"🕐 Last backup: {hours}h {minutes}m ago")
                         
                         # Calculate time until next backup (3 hours from last backup)
-                        next_backup = last_backup + timedelta(hours=3)
-                        time_until = next_backup - datetime.now()
+                        next_backup = last_backup + BACKUP_INTERVAL
+                        time_until = next_backup - now
                         
                         if time_until.total_seconds() > 0:
                             hours_until = int(time_until.total_seconds() / 3600)
@@ -1023,11 +2200,11 @@ def main():
                 
                 # Force page refresh every 30 seconds to update timer and trigger auto-backups
                 if 'last_refresh' not in st.session_state:
-                    st.session_state.last_refresh = datetime.now()
-                
-                time_since_refresh = datetime.now() - st.session_state.last_refresh
-                if time_since_refresh > timedelta(seconds=30):
-                    st.session_state.last_refresh = datetime.now()
+                    st.session_state.last_refresh = now
+
+                time_since_refresh = now - st.session_state.last_refresh
+                if time_since_refresh > REFRESH_INTERVAL:
+                    st.session_state.last_refresh = now
                     st.rerun()
         else:
             selected_channel = None
@@ -1046,7 +2223,7 @@ def main():
                 for ch_name in st.session_state.channel_manager.get_channel_names():
                     last_bk = st.session_state.last_backup.get(ch_name)
                     if last_bk:
-                        time_ago = datetime.now() - last_bk
+                        time_ago = now - last_bk
                         hours_ago = int(time_ago.total_seconds() / 3600)
                         minutes_ago = int((time_ago.total_seconds() % 3600) / 60)
                         st.write(f"• {ch_name}: {hours_ago}h {minutes_ago}m ago")
@@ -1118,7 +2295,9 @@ def main():
                         if hasattr(st.session_state, 'channel_manager') and st.session_state.channel_manager:
                             if st.session_state.channel_manager.backup_channel_files(selected_channel):
                                 st.success(f"✅ Backup created for {selected_channel}")
-                                st.session_state.last_backup[selected_channel] = datetime.now()
+                                backup_done = datetime.now()
+                                st.session_state.last_backup[selected_channel] = backup_done
+                                st.session_state.setdefault('next_backup_at', {})[selected_channel] = backup_done + BACKUP_INTERVAL
                             else:
                                 st.warning("Backup failed - check Google Drive connection")
                         else:
@@ -1139,7 +2318,7 @@ def main():
                     st.session_state.delete_titles_modal = selected_channel
         
         # Handle bulk add titles modal
-        if 'add_titles_modal' in st.session_state and st.session_state.add_titles_modal == selected_channel:
+        if st.session_state.get('add_titles_modal') == selected_channel:
             st.markdown("---")
             with st.expander("📝 **Add Existing Titles**", expanded=True):
                 st.info(f"Add existing titles to **{selected_channel}** to prevent duplicates in future generations.")
@@ -1163,7 +2342,7 @@ def main():
                     if st.button("➕ Add Titles", type="primary"):
                         if bulk_titles_input.strip():
                             # Split by lines and clean up
-                            titles_list = [line.strip() for line in bulk_titles_input.split('\n') if line.strip()]
+                            titles_list = [s for s in map(str.strip, bulk_titles_input.splitlines()) if s]
                             
                             if titles_list:
                                 try:
@@ -1202,13 +2381,13 @@ def main():
                 with col3:
                     # Show current title count
                     try:
-                        current_titles = st.session_state.channel_manager.get_used_titles(selected_channel, force_refresh=False)
+                        current_titles = _cached_used_titles(selected_channel, _titles_version(selected_channel))
                         st.write(f"**Current titles in {selected_channel}: {len(current_titles)}**")
                     except Exception as e:
                         st.write(f"**Current titles: Unable to load** ({str(e)})")
         
         # Handle delete titles modal
-        if 'delete_titles_modal' in st.session_state and st.session_state.delete_titles_modal == selected_channel:
+        if st.session_state.get('delete_titles_modal') == selected_channel:
             st.markdown("---")
             with st.expander("🗑️ **Delete Existing Titles**", expanded=True):
                 st.info(f"Select titles to delete from **{selected_channel}**. Use checkboxes for batch deletion.")
@@ -1237,9 +2416,7 @@ def main():
                                 if deleted_count > 0:
                                     st.success(f"✅ Deleted {deleted_count} titles")
                                     # Clear cache and selection
-                                    cache_key = f"cached_titles_{selected_channel}"
-                                    if cache_key in st.session_state:
-                                        del st.session_state[cache_key]
+                                    st.session_state.channel_manager.invalidate_titles_cache(selected_channel)
                                     st.session_state.selected_for_deletion.clear()
                                     st.rerun()
                                 else:
@@ -1248,9 +2425,7 @@ def main():
                 with col3:
                     if st.button("🔄 Force Refresh", help="Force reload from Google Drive"):
                         # Clear all caches and force Google Drive refresh
-                        cache_key = f"cached_titles_{selected_channel}"
-                        if cache_key in st.session_state:
-                            del st.session_state[cache_key]
+                        st.session_state.channel_manager.invalidate_titles_cache(selected_channel)
                         ordered_cache_key = f"ordered_titles_{selected_channel}"
                         if ordered_cache_key in st.session_state:
                             del st.session_state[ordered_cache_key]
@@ -1321,7 +2496,7 @@ def main():
                                     
                                     # Find and delete the existing file
                                     existing_files = drive_service.files().list(
-                                        q=f"name='{filename}' and parents='{channel_folder_id}' and trashed=false",
+                                        q=f"name='{GoogleDriveManager._q_escape(filename)}' and parents='{channel_folder_id}' and trashed=false",
                                         fields="files(id, name)"
                                     ).execute()
                                     
@@ -1335,15 +2510,17 @@ def main():
                                 except Exception as e:
                                     st.error(f"Failed to recreate file: {str(e)}")
                             
-                            st.write("**Or manually fix in Google Drive:**")
-                            st.write("1. Go to your Google Drive Swipecore folder")
-                            st.write("2. Delete the existing titles_swipecore.txt file")
-                            st.write("3. Create a new file with the same name")
-                            st.write("4. Add your titles and save")
-                            st.write("5. Come back and try the Force Refresh button")
+                            st.markdown(
+                                "**Or manually fix in Google Drive:**\n"
+                                "1. Go to your Google Drive Swipecore folder\n"
+                                "2. Delete the existing titles_swipecore.txt file\n"
+                                "3. Create a new file with the same name\n"
+                                "4. Add your titles and save\n"
+                                "5. Come back and try the Force Refresh button"
+                            )
                     
                     if content and content.strip():
-                        titles_list = [line.strip() for line in content.split('\n') if line.strip()]
+                        titles_list = [s for s in map(str.strip, content.splitlines()) if s]
                     else:
                         titles_list = []
                         if not show_debug:
@@ -1503,7 +2680,7 @@ def main():
                     st.rerun()
         
         # Handle channel deletion confirmation
-        if 'delete_channel_confirm' in st.session_state and st.session_state.delete_channel_confirm == selected_channel:
+        if st.session_state.get('delete_channel_confirm') == selected_channel:
             st.markdown("---")
             with st.expander("⚠️ **CONFIRM: Delete Channel**", expanded=True):
                 st.error(f"**WARNING:** This will remove **{selected_channel}** from the dropdown!")
@@ -1537,7 +2714,7 @@ def main():
                         st.rerun()
         
         # Handle prompt editing (no password needed for admins)
-        if 'editing_prompt' in st.session_state and st.session_state.editing_prompt == selected_channel:
+        if st.session_state.get('editing_prompt') == selected_channel:
             if user_role == 'admin':
                 current_prompt = st.session_state.channel_manager.get_channel_prompt(selected_channel)
                 edited_prompt = st.text_area("Edit channel prompt:", value=current_prompt, height=400, key="prompt_editor")
@@ -1558,77 +2735,28 @@ def main():
                 st.error("You don't have permission to edit prompts")
                 del st.session_state.editing_prompt
         
-        # Clear Titles Confirmation Dialog
-        if 'clear_titles_confirm' in st.session_state and st.session_state.clear_titles_confirm == selected_channel:
-            st.markdown("---")
-            with st.expander("⚠️ **CONFIRM: Clear All Titles**", expanded=True):
-                st.error(f"**WARNING:** This will delete ALL titles for {selected_channel}!")
-                st.write("This action cannot be undone (but a backup will be created first).")
-                
-                # First confirmation
-                confirm1 = st.checkbox("I understand this will delete all titles", key="clear_titles_confirm1")
-                
-                # Second confirmation  
-                confirm2 = st.checkbox("I really want to delete all titles", key="clear_titles_confirm2")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("🗑️ Yes, Clear All Titles", type="primary", disabled=not (confirm1 and confirm2)):
-                        # Create backup first
-                        st.session_state.channel_manager.backup_channel_files(selected_channel)
-                        # Clear titles
-                        if st.session_state.channel_manager.clear_titles(selected_channel):
-                            st.success(f"✅ All titles cleared for {selected_channel}")
-                            del st.session_state.clear_titles_confirm
-                            st.rerun()
-                
-                with col2:
-                    if st.button("❌ Cancel", key="cancel_clear_titles"):
-                        del st.session_state.clear_titles_confirm
-                        st.rerun()
-        
+        # Clear Titles Confirmation Dialog (fragment: checkbox toggles only
+        # rerun the dialog, not the whole app)
+        if st.session_state.get('clear_titles_confirm') == selected_channel:
+            _clear_confirm_dialog("titles", selected_channel)
+
         # Clear Scripts Confirmation Dialog
-        if 'clear_scripts_confirm' in st.session_state and st.session_state.clear_scripts_confirm == selected_channel:
-            st.markdown("---")
-            with st.expander("⚠️ **CONFIRM: Clear All Scripts**", expanded=True):
-                st.error(f"**WARNING:** This will delete ALL scripts for {selected_channel}!")
-                st.write("This action cannot be undone (but a backup will be created first).")
-                
-                # First confirmation
-                confirm1 = st.checkbox("I understand this will delete all scripts", key="clear_scripts_confirm1")
-                
-                # Second confirmation
-                confirm2 = st.checkbox("I really want to delete all scripts", key="clear_scripts_confirm2")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("🗑️ Yes, Clear All Scripts", type="primary", disabled=not (confirm1 and confirm2)):
-                        # Create backup first
-                        st.session_state.channel_manager.backup_channel_files(selected_channel)
-                        # Clear scripts
-                        if st.session_state.channel_manager.clear_scripts(selected_channel):
-                            st.success(f"✅ All scripts cleared for {selected_channel}")
-                            del st.session_state.clear_scripts_confirm
-                            st.rerun()
-                
-                with col2:
-                    if st.button("❌ Cancel", key="cancel_clear_scripts"):
-                        del st.session_state.clear_scripts_confirm
-                        st.rerun()
+        if st.session_state.get('clear_scripts_confirm') == selected_channel:
+            _clear_confirm_dialog("scripts", selected_channel)
         
         st.markdown("---")
         
         # Show last successful generation results if they exist
-        if 'last_successful_generation' in st.session_state and st.session_state.last_successful_generation.get('channel') == selected_channel:
-            gen_data = st.session_state.last_successful_generation
-            
+        gen_data = st.session_state.get('last_successful_generation')
+        if gen_data and gen_data.get('channel') == selected_channel:
+
             st.success(f"✅ Last generation completed successfully! Found {len(gen_data['titles'])} titles.")
             
             # Show titles
             if gen_data['titles']:
                 st.subheader("📋 Extracted Titles:")
-                for i, title in enumerate(gen_data['titles'], 1):
-                    st.write(f"{i}. {title}")
+                # One markdown message instead of one widget per title
+                st.markdown("\n".join(f"{i}. {title}" for i, title in enumerate(gen_data['titles'], 1)))
             
             # Show script
             st.subheader("📄 Generated Script:")
@@ -1702,408 +2830,16 @@ def main():
                         st.rerun()
                 with col2:
                     if st.button("🔄 Refresh Channel Manager"):
-                        st.session_state.channel_manager = ChannelManager(st.session_state.drive_manager)
+                        # Rebuild through the factory so every session picks
+                        # up the fresh manager, not just this one
+                        get_channel_manager.clear()
+                        st.session_state.channel_manager = get_channel_manager()
                         st.success("Channel manager refreshed!")
                         st.rerun()
         
-        # Script generation
-        st.subheader("🎯 Generate New Scripts")
-        
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            extra_prompt = st.text_input("Extra prompt (optional):", help="Add any specific instructions for this generation")
-        with col2:
-            num_scripts = st.number_input("🔢 Number of scripts:", min_value=1, max_value=10, value=1, step=1, help="Generate 1-10 scripts at once")
-        
-        # Create button (no disabled state needed for direct generation)
-        generate_button = st.button(
-            "🚀 Generate Scripts", 
-            type="primary",
-            key="generate_button"
-        )
-        
-        # Process generation only when button is clicked
-        if generate_button:
-            try:
-                with st.spinner(f"🎬 Generating {num_scripts} script{'s' if num_scripts > 1 else ''}... This may take {10 * int(num_scripts)}-{30 * int(num_scripts)} seconds..."):
-                    try:
-                        # Try with force_refresh first, fallback without it if there's an error
-                        try:
-                            used_titles = st.session_state.channel_manager.get_used_titles(selected_channel, force_refresh=True)
-                        except TypeError:
-                            # Fallback for old method signature - refresh channel manager
-                            st.warning("Refreshing channel manager...")
-                            st.session_state.channel_manager = ChannelManager(st.session_state.drive_manager)
-                            used_titles = st.session_state.channel_manager.get_used_titles(selected_channel, force_refresh=True)
-                        
-                        # Debug: Show how many titles we're excluding
-                        if user_role == 'admin':
-                            st.info(f"📊 Loading exclusion list: Found {len(used_titles)} existing titles for {selected_channel}")
-                    except Exception as titles_error:
-                        st.error(f"❌ Error loading titles: {str(titles_error)}")
-                        used_titles = set()  # Continue with empty set
-                    
-                    # Build exclusion list
-                    base_prompt = st.session_state.channel_manager.get_channel_prompt(selected_channel)
-                    full_prompt = base_prompt
-                    
-                    if used_titles:
-                        # Get all used movies with years for complete blocking
-                        used_titles_list = list(used_titles)
-                        used_movies_with_years = set()
-                        
-                        # Extract complete movie names with years
-                        for title in used_titles_list:
-                            movie, _ = SimilarityChecker.extract_movie_and_fact(title)
-                            if movie:
-                                used_movies_with_years.add(movie)
-                        
-                        # Build exclusion prompt optimized for ~4k tokens
-                        if used_titles_list:
-                            st.session_state.last_loaded_titles = used_titles_list
-                            
-                            # Calculate how many titles we can fit in ~4k tokens
-                            # Rough estimate: prompt overhead ~500 tokens, leaving 3500 for titles
-                            # Average title ~20 tokens, so we can fit ~175 titles
-                            max_titles_for_tokens = 175
-                            
-                            # Send the most recent titles (most likely to be duplicated)
-                            if len(used_titles_list) > max_titles_for_tokens:
-                                titles_to_send = used_titles_list[-max_titles_for_tokens:]  # Most recent 175
-                                all_existing_titles = "\n".join(titles_to_send)
-                                titles_note = f" (Recent {len(titles_to_send)} of {len(used_titles_list)} total)"
-                            else:
-                                all_existing_titles = "\n".join(used_titles_list)
-                                titles_note = ""
-                            
-                            # Create exclusion prompt (optimized for token usage)
-                            exclusion_text = f"""
-🛑 RECENT TITLES FROM MY COLLECTION{titles_note} 🛑
-
-These are my most recent movie facts. DO NOT use any movie that appears below:
-
-{all_existing_titles}
-
-⚠️ RULES:
-1. Every movie above has been used - they are ALL off-limits
-2. Pick a movie that is NOT in the list above
-3. Each movie can only be used ONCE
-
-🎯 Generate a fact about a movie NOT in my list.
-"""
-                            full_prompt = f"{exclusion_text}\n\n{base_prompt}"
-                        
-                        # Keep prompt concise for token efficiency
-                        pass
-                    else:
-                        # No existing titles to exclude
-                        pass
-                    
-                    if extra_prompt.strip():
-                        full_prompt += " " + extra_prompt.strip()
-                    
-                    # Debug: Show admin what the AI is receiving (for troubleshooting)
-                    if user_role == 'admin':
-                        with st.expander("🔍 **DEBUG: View AI Prompt** (Admin Only)", expanded=False):
-                            st.text_area("Full prompt sent to AI:", value=full_prompt, height=200, disabled=True)
-                            if used_titles:
-                                st.write(f"**Total titles in Google Drive file:** {len(used_titles)}")
-                                # Show sample of actual titles being passed
-                                with st.expander("View sample from Google Drive file", expanded=False):
-                                    for i, title in enumerate(list(used_titles)[:15], 1):
-                                        st.caption(f"{i}. {title}")
-                                    if len(used_titles) > 15:
-                                        st.caption(f"... and {len(used_titles) - 15} more titles in file")
-                            # Calculate and show prompt size
-                            prompt_length = len(full_prompt)
-                            estimated_tokens = prompt_length / 4  # Rough estimate: 1 token ≈ 4 characters
-                            st.write(f"**Prompt length:** {prompt_length:,} characters (≈{int(estimated_tokens):,} tokens)")
-                    
-                    # Generate multiple scripts
-                    all_generated_scripts = []
-                    total_added = 0
-                    total_blocked = 0
-                    session_used_movies = set()  # Track movies used in THIS session
-                    
-                    for script_num in range(int(num_scripts)):
-                        st.write(f"🔄 Generating script {script_num + 1} of {int(num_scripts)}...")
-                        
-                        # REBUILD prompt for each generation with UPDATED complete titles file
-                        if script_num > 0:
-                            # Get fresh titles including ones just added from this session
-                            used_titles = st.session_state.channel_manager.get_used_titles(selected_channel, force_refresh=True)
-                            used_titles_list = list(used_titles)
-                            
-                            # Get updated titles optimized for ~4k tokens
-                            max_titles_for_tokens = 175  # ~3500 tokens for titles
-                            
-                            if len(used_titles_list) > max_titles_for_tokens:
-                                titles_to_send = used_titles_list[-max_titles_for_tokens:]  # Most recent
-                                all_existing_titles = "\n".join(titles_to_send)
-                                titles_note = f" ({len(titles_to_send)} recent of {len(used_titles_list)} total)"
-                            else:
-                                all_existing_titles = "\n".join(used_titles_list)
-                                titles_note = ""
-                            
-                            # Create updated exclusion prompt (optimized for tokens)
-                            exclusion_text = f"""
-🛑 UPDATED TITLES{titles_note} 🛑
-
-Script {script_num} just added new titles. This is the updated list:
-
-{all_existing_titles}
-
-⚠️ ALL movies above are OFF-LIMITS. Pick a different movie.
-"""
-                            # Combine with user's instructions
-                            script_prompt = f"{exclusion_text}\n\n{base_prompt}"
-                            
-                            if extra_prompt.strip():
-                                script_prompt += "\n\nAdditional instructions: " + extra_prompt.strip()
-                            
-                            script_prompt += "\n\n⚠️ MOVIE RULES: NEVER reuse a movie. Each movie gets ONE fact only. Check the BANNED MOVIES list and pick something completely different."
-                        else:
-                            # First script uses original prompt
-                            script_prompt = full_prompt
-                        
-                        # Keep reminders brief for token efficiency
-                        script_prompt += "\n\n⚠️ Don't use any movie from the list above!"
-                        
-                        # Debug: Show the ACTUAL prompt being sent for THIS script
-                        if user_role == 'admin':
-                            with st.expander(f"🔍 **DEBUG: Full Prompt for Script {script_num + 1}** (Admin Only)", expanded=False):
-                                st.text_area(f"Exact prompt being sent to AI for script {script_num + 1}:", 
-                                           value=script_prompt, height=300, disabled=True, 
-                                           key=f"debug_prompt_{script_num}")
-                                # Show stats
-                                prompt_length = len(script_prompt)
-                                estimated_tokens = prompt_length / 4
-                                st.write(f"**Prompt length:** {prompt_length:,} characters (≈{int(estimated_tokens):,} tokens)")
-                                
-                                # Show titles count
-                                if 'used_titles_list' in locals():
-                                    st.write(f"**Total titles in Google Drive file:** {len(used_titles_list)}")
-                                    with st.expander("View sample titles from file", expanded=False):
-                                        sample_titles = used_titles_list[:20] if 'used_titles_list' in locals() else []
-                                        for i, title in enumerate(sample_titles, 1):
-                                            st.caption(f"{i}. {title}")
-                                        if len(used_titles_list) > 20:
-                                            st.caption(f"... and {len(used_titles_list) - 20} more")
-                                
-                                if script_num > 0:
-                                    st.write(f"**Movies added this session:** {len(session_used_movies)}")
-                                    if session_used_movies:
-                                        st.caption("Session movies: " + ", ".join(list(session_used_movies)[:5]))
-                        
-                        # Retry logic for when AI uses banned movies
-                        max_retries = 3
-                        retry_count = 0
-                        script_generated = False
-                        
-                        while retry_count < max_retries and not script_generated:
-                            try:
-                                session_id = str(uuid.uuid4())
-                                result = st.session_state.claude_client.generate_script(script_prompt, session_id)
-                            except Exception as api_error:
-                                st.error(f"❌ API Error for script {script_num + 1}: {str(api_error)}")
-                                break
-                            
-                            if result["success"]:
-                                # Initialize variables to ensure they're always defined
-                                content = result.get("content", "No content available")
-                                titles = []
-                                
-                                try:
-                                    # Extract and save titles
-                                    titles = extract_titles_from_response(content)
-                                    
-                                    # Debug: Show what titles were found
-                                    if user_role == 'admin':
-                                        st.info(f"🔍 Debug: Extracted {len(titles)} titles from script {script_num + 1}")
-                                    
-                                    # PRE-CHECK: See if AI used a movie from the Google Drive file
-                                    will_be_blocked = False
-                                    blocked_movie = None
-                                    
-                                    # Get current titles to check against
-                                    current_titles = st.session_state.channel_manager.get_used_titles(selected_channel, force_refresh=True)
-                                    
-                                    for title in titles:
-                                        # Check if this title would be blocked as a duplicate
-                                        is_dup, reason = SimilarityChecker.is_duplicate_title(title, current_titles)
-                                        if is_dup:
-                                            will_be_blocked = True
-                                            movie, _ = SimilarityChecker.extract_movie_and_fact(title)
-                                            blocked_movie = movie if movie else title
-                                            if retry_count == 0:
-                                                st.warning(f"⚠️ AI tried to use: {blocked_movie} (Reason: {reason})")
-                                            break
-                                    
-                                    # If AI used a movie from the file, retry with stronger prompt
-                                    if will_be_blocked and retry_count < max_retries - 1:
-                                        retry_count += 1
-                                        st.warning(f"🔄 Retrying script {script_num + 1} (attempt {retry_count + 1}/{max_retries}) - AI used a movie from the Google Drive file")
-                                        
-                                        # Rebuild prompt with REJECTION notice at the top
-                                        rejection_notice = f"❌❌❌ YOUR PREVIOUS ATTEMPT WAS REJECTED ❌❌❌\n\n"
-                                        rejection_notice += f"You tried to use '{blocked_movie}' which is already in my Google Drive file!\n"
-                                        rejection_notice += f"DO NOT use ANY movie from the Google Drive file.\n"
-                                        rejection_notice += f"Pick a COMPLETELY DIFFERENT movie that is NOT in the file.\n\n"
-                                        
-                                        # Prepend rejection notice to original prompt (not doubling it)
-                                        original_prompt = script_prompt  # Keep original for reference
-                                        script_prompt = rejection_notice + original_prompt
-                                        continue
-                                    
-                                    # If not blocked or max retries reached, proceed
-                                    added_count = 0
-                                    blocked_titles = []
-                                    
-                                    for title in titles:
-                                        try:
-                                            # Get fresh titles to check against
-                                            current_titles = st.session_state.channel_manager.get_used_titles(selected_channel, force_refresh=True)
-                                            is_dup, reason = SimilarityChecker.is_duplicate_title(title, current_titles)
-                                        
-                                            if not is_dup:
-                                                if st.session_state.channel_manager.add_title(selected_channel, title):
-                                                    added_count += 1
-                                                    # Track movie for this session
-                                                    movie, _ = SimilarityChecker.extract_movie_and_fact(title)
-                                                    if movie:
-                                                        session_used_movies.add(movie)
-                                                    if user_role == 'admin':
-                                                        st.caption(f"✅ Saved title: {title}")
-                                            else:
-                                                blocked_titles.append((title, reason))
-                                                total_blocked += 1
-                                                if user_role == 'admin':
-                                                    st.caption(f"🚫 Blocked title: {title} (Reason: {reason})")
-                                                
-                                                # If ALL titles from this script were blocked, show warning
-                                                if len(blocked_titles) == len(titles) and len(titles) > 0:
-                                                    st.error(f"⚠️ Script {script_num + 1}: All titles were duplicates! The AI ignored the Google Drive file.")
-                                        except Exception as title_error:
-                                            st.error(f"❌ Failed to process title '{title}': {str(title_error)}")
-                                
-                                    # Save script
-                                    try:
-                                        user_name = current_user.get('first_name', 'Unknown User')
-                                        st.session_state.channel_manager.save_script(selected_channel, content, session_id, user_name)
-                                    except Exception as script_error:
-                                        st.error(f"❌ Failed to save script {script_num + 1}: {str(script_error)}")
-                                    
-                                    # Store script info
-                                    script_info = {
-                                        "script_number": script_num + 1,
-                                        "content": content,
-                                        "titles": titles,
-                                        "added_titles": added_count,
-                                        "blocked_titles": blocked_titles,
-                                        "session_id": session_id,
-                                        "token_usage": result.get('token_usage', {})
-                                    }
-                                    all_generated_scripts.append(script_info)
-                                    total_added += added_count
-                                    script_generated = True  # Mark as successful
-                                    
-                                except Exception as processing_error:
-                                    st.error(f"❌ Error processing script {script_num + 1}: {str(processing_error)}")
-                                    script_generated = True  # Still mark as done to avoid infinite loop
-                            else:
-                                st.error(f"❌ Script {script_num + 1} generation failed: {result.get('error', 'Unknown error')}")
-                                break  # Exit retry loop on API failure
-                    
-                    # Display overall results
-                    if all_generated_scripts:
-                        # Calculate success metrics
-                        total_scripts = len(all_generated_scripts)
-                        success_rate = (total_added / total_scripts * 100) if total_scripts > 0 else 0
-                        duplicate_rate = (total_blocked / total_scripts * 100) if total_scripts > 0 else 0
-                        
-                        # Determine quality rating
-                        if duplicate_rate == 0:
-                            quality_msg = "🏆 **PERFECT!** Zero duplicates - 100% unique content!"
-                            quality_color = "success"
-                        elif duplicate_rate <= 20:
-                            quality_msg = "🎯 **EXCELLENT!** Very low duplicate rate!"
-                            quality_color = "success"
-                        elif duplicate_rate <= 40:
-                            quality_msg = "👍 **GOOD!** Acceptable duplicate rate!"
-                            quality_color = "info"
-                        else:
-                            quality_msg = "⚠️ **NEEDS IMPROVEMENT** - Consider using more diverse movies"
-                            quality_color = "warning"
-                        
-                        # Display comprehensive statistics
-                        st.success(f"✅ Generated {total_scripts} script{'s' if total_scripts > 1 else ''}!")
-                        
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("✅ Unique Titles Added", total_added)
-                        with col2:
-                            st.metric("🚫 Duplicates Blocked", total_blocked)
-                        with col3:
-                            st.metric("📊 Success Rate", f"{success_rate:.0f}%")
-                        
-                        # Show quality assessment
-                        if quality_color == "success":
-                            st.success(quality_msg)
-                        elif quality_color == "info":
-                            st.info(quality_msg)
-                        else:
-                            st.warning(quality_msg)
-                    
-                    # Display each script
-                    for script_info in all_generated_scripts:
-                        script_num = script_info["script_number"]
-                        content = script_info["content"]
-                        titles = script_info["titles"]
-                        added_count = script_info["added_titles"]
-                        blocked_titles = script_info["blocked_titles"]
-                        session_id = script_info["session_id"]
-                        
-                        st.markdown("---")
-                        st.subheader(f"📄 Script #{script_num}")
-                        
-                        # Show title statistics for this script
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Total Titles", len(titles))
-                        with col2:
-                            st.metric("Added", added_count, delta=added_count if added_count > 0 else None)
-                        with col3:
-                            st.metric("Blocked", len(blocked_titles), delta=f"-{len(blocked_titles)}" if blocked_titles else None)
-                        
-                        # Show blocked titles with reasons
-                        if blocked_titles:
-                            with st.expander(f"🚫 Blocked Titles for Script #{script_num} ({len(blocked_titles)})", expanded=False):
-                                for blocked_title, reason in blocked_titles:
-                                    st.write(f"❌ **{blocked_title}**")
-                                    st.caption(f"   Reason: {reason}")
-                        
-                        # Show accepted titles
-                        accepted_titles = [title for title in titles if not any(title == bt[0] for bt in blocked_titles)]
-                        if accepted_titles:
-                            with st.expander(f"✅ Added Titles for Script #{script_num} ({len(accepted_titles)})", expanded=False):
-                                for i, title in enumerate(accepted_titles, 1):
-                                    st.write(f"{i}. {title}")
-                        
-                        # Show script content
-                        with st.expander(f"📜 View Script #{script_num} Content", expanded=len(all_generated_scripts) == 1):
-                            st.text_area(
-                                f"Script #{script_num} Content:",
-                                value=content,
-                                height=400,
-                                disabled=True,
-                                key=f"script_{session_id}"
-                            )
-                            
-                            if content:
-                                st.caption(f"📊 {len(content.split())} words, {len(content)} characters")
-                    
-            except Exception as e:
-                st.error(f"❌ Outer error: {str(e)}")
+        # Script generation panel (fragment: generate clicks rerun only
+        # the panel, not the whole app)
+        _generation_panel(selected_channel, user_role)
     
     else:
         st.info("👈 Select a channel from the sidebar or create a new one to get started!")